@@ -31,6 +31,18 @@ PBKDF2_ITERATIONS = 390000
 SALT_SIZE = 16
 AES_NONCE_SIZE = 12
 AES_TAG_SIZE = 16
+AES_CHUNK_SIZE = 32 * 1024 # Bytes fed to the GCM encryptor/decryptor per update()
+
+# Vault header (vaults written since scrypt was introduced)
+# Blob layout: suite_id(1) || log2(n)(1) || r(1) || p(1) || salt || nonce || ct+tag
+# suite_id selects the AEAD; all suites derive the key with scrypt.
+# Vaults without a header are legacy PBKDF2 + AES-GCM vaults.
+VAULT_SUITE_SCRYPT_AESGCM = 0x01
+VAULT_SUITE_SCRYPT_CHACHA20 = 0x02 # Used on CPUs without AES instructions
+VAULT_HEADER_SIZE = 4
+SCRYPT_N_LOG2 = 15
+SCRYPT_R = 8
+SCRYPT_P = 1
 
 # Path for icons, assuming "icons" folder is at the project root
 # or relative to where the main script is executed.
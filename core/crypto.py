@@ -1,10 +1,15 @@
 import os
 import json
-import base64
+import mmap
+import logging
 import hashlib
+import threading
+from collections import OrderedDict
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
 from cryptography.hazmat.backends import default_backend
 
 # Import constants
@@ -12,11 +17,51 @@ from constants import (
     PBKDF2_ITERATIONS,
     SALT_SIZE,
     AES_NONCE_SIZE,
-    AES_TAG_SIZE
+    AES_TAG_SIZE,
+    AES_CHUNK_SIZE,
+    VAULT_SUITE_SCRYPT_AESGCM,
+    VAULT_SUITE_SCRYPT_CHACHA20,
+    VAULT_HEADER_SIZE,
+    SCRYPT_N_LOG2,
+    SCRYPT_R,
+    SCRYPT_P
 )
-from .utils import ensure_dir # from mindvault.core.utils
 
-def derive_key(password: str, salt: bytes) -> bytes:
+logger = logging.getLogger("mindvault")
+
+try:
+    import orjson # Optional: much faster (de)serialization of large vaults
+except ImportError:
+    orjson = None
+
+# Derived keys for the current session, keyed by (sha256(password), salt, vault header).
+# The KDF is the dominant cost of every unlock/save, so reusing its output
+# turns repeated saves into a dict lookup. Keys are held in bytearrays so they
+# can be wiped in place when evicted or when the vault is locked; callers only
+# ever get a copy (and wipe it when done), since the encryption of a save may
+# still be running on a worker thread when the cache is cleared.
+_KEY_CACHE_SIZE = 8
+_key_cache = OrderedDict()
+# Unlock runs the KDF on a worker thread, so the cache is only touched under
+# this lock. The KDF itself runs outside it.
+_cache_lock = threading.RLock()
+
+def _password_digest(password: str) -> bytes:
+    return hashlib.sha256(password.encode('utf-8')).digest()
+
+def _wipe(buf: bytearray):
+    buf[:] = bytes(len(buf)) # Same-length slice assignment overwrites in place
+
+def _run_kdf(kdf, password: str) -> bytearray:
+    key = bytearray(32)
+    derive_into = getattr(kdf, "derive_into", None) # cryptography >= 46
+    if derive_into is not None:
+        derive_into(password.encode('utf-8'), key)
+    else:
+        key[:] = kdf.derive(password.encode('utf-8'))
+    return key
+
+def _pbkdf2(password: str, salt: bytes) -> bytearray:
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
@@ -24,46 +69,217 @@ def derive_key(password: str, salt: bytes) -> bytes:
         iterations=PBKDF2_ITERATIONS,
         backend=default_backend()
     )
-    return kdf.derive(password.encode('utf-8'))
+    return _run_kdf(kdf, password)
 
-def encrypt_data(data: dict, derived_key: bytes) -> bytes | None:
+def _scrypt(password: str, salt: bytes, n_log2: int, r: int, p: int) -> bytearray:
+    kdf = Scrypt(
+        salt=salt,
+        length=32,
+        n=2 ** n_log2,
+        r=r,
+        p=p,
+        backend=default_backend()
+    )
+    return _run_kdf(kdf, password)
+
+def _cpu_has_aes() -> bool:
+    # Linux exposes the AES-NI (x86) / ARMv8 crypto extension flag in /proc/cpuinfo.
+    # Elsewhere assume hardware AES, which every supported desktop CPU has.
     try:
-        json_data = json.dumps(data, ensure_ascii=False).encode('utf-8')
-        aesgcm = AESGCM(derived_key)
+        with open("/proc/cpuinfo", "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.strip() in ("flags", "Features"):
+                    return "aes" in value.split()
+    except OSError:
+        pass
+    return True
+
+# Software AES-GCM is several times slower than ChaCha20-Poly1305, so
+# new vaults use ChaCha20 on hosts without AES instructions.
+_DEFAULT_SUITE = VAULT_SUITE_SCRYPT_AESGCM if _cpu_has_aes() else VAULT_SUITE_SCRYPT_CHACHA20
+_VAULT_SUITES = (VAULT_SUITE_SCRYPT_AESGCM, VAULT_SUITE_SCRYPT_CHACHA20)
+
+def default_vault_header() -> bytes:
+    return bytes((_DEFAULT_SUITE, SCRYPT_N_LOG2, SCRYPT_R, SCRYPT_P))
+
+def _is_vault_header(header: bytes) -> bool:
+    # Sanity bounds keep a legacy salt from being mistaken for a header
+    # (and cap a corrupted header at 128 * r * 2**n = 256 MiB of scrypt memory).
+    if len(header) != VAULT_HEADER_SIZE or header[0] not in _VAULT_SUITES:
+        return False
+    n_log2, r, p = header[1], header[2], header[3]
+    return 10 <= n_log2 <= 17 and 1 <= r <= 16 and 1 <= p <= 16
+
+def derive_key(password: str, salt: bytes, header: bytes = b"") -> bytearray:
+    """
+    Derives the 32-byte vault key. An empty header selects the legacy
+    PBKDF2 derivation, otherwise the scrypt parameters are read from it.
+    Returns a fresh copy the caller owns and should _wipe() after use.
+    """
+    header = bytes(header)
+    cache_key = (_password_digest(password), bytes(salt), header)
+    with _cache_lock:
+        key = _key_cache.get(cache_key)
+        if key is not None:
+            _key_cache.move_to_end(cache_key)
+            return bytearray(key)
+    if header:
+        key = _scrypt(password, salt, header[1], header[2], header[3])
+    else:
+        key = _pbkdf2(password, salt)
+    with _cache_lock:
+        cached = _key_cache.get(cache_key)
+        if cached is not None: # Another thread derived it meanwhile; keep a single copy
+            _wipe(key)
+            return bytearray(cached)
+        _key_cache[cache_key] = key
+        if len(_key_cache) > _KEY_CACHE_SIZE:
+            _wipe(_key_cache.popitem(last=False)[1])
+        return bytearray(key)
+
+def _cipher_for(derived_key, suite: int):
+    # ChaCha20Poly1305 for the ChaCha suite, otherwise the AES algorithm object
+    # that each GCM encryptor/decryptor is built from. Deliberately built per operation
+    # and not cached per key: setting up the cipher costs microseconds against the
+    # KDF's tens of milliseconds, while a cached object would hold a copy of the key
+    # that outlives clear_key_cache() and can't be wiped.
+    if suite == VAULT_SUITE_SCRYPT_CHACHA20:
+        return ChaCha20Poly1305(derived_key)
+    return algorithms.AES(derived_key)
+
+def _cached_salt_for(password: str, header: bytes) -> bytes | None:
+    # Most recently used salt for this password, so saves within a session
+    # can reuse the already-derived key instead of running the KDF again.
+    pw_hash = _password_digest(password)
+    with _cache_lock:
+        for cached_pw_hash, salt, cached_header in reversed(_key_cache):
+            if cached_pw_hash == pw_hash and cached_header == header:
+                return salt
+    return None
+
+def clear_key_cache():
+    with _cache_lock:
+        for key in _key_cache.values():
+            _wipe(key)
+        _key_cache.clear()
+
+def _dump_json(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) # Already UTF-8 bytes without ASCII escaping
+    # ensure_ascii=True would make the encode() a plain copy, but turns every
+    # non-Latin character (e.g. Arabic) into a 6-byte \uXXXX escape, which then
+    # has to be encrypted and written; compact separators match orjson's output.
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _load_json(raw) -> dict:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def encrypt_data(data: dict, derived_key: bytes, suite: int = VAULT_SUITE_SCRYPT_AESGCM,
+                 prefix: bytes = b"") -> bytearray | None:
+    # Output layout matches AESGCM.encrypt: nonce || ciphertext || tag, after prefix
+    # (the vault header and salt), so the whole file is built in a single buffer
+    # instead of being copied again by concatenation. The plaintext is fed through
+    # in AES_CHUNK_SIZE slices.
+    try:
+        json_data = memoryview(_dump_json(data))
         nonce = os.urandom(AES_NONCE_SIZE)
-        encrypted_data = aesgcm.encrypt(nonce, json_data, None)
-        return nonce + encrypted_data
+        if suite == VAULT_SUITE_SCRYPT_CHACHA20:
+            return bytearray(b"".join((prefix, nonce, _cipher_for(derived_key, suite).encrypt(nonce, json_data, None))))
+        encryptor = Cipher(_cipher_for(derived_key, suite), modes.GCM(nonce), backend=default_backend()).encryptor()
+        size = len(json_data)
+        pos = len(prefix)
+        out = bytearray(pos + AES_NONCE_SIZE + size + AES_TAG_SIZE)
+        out[:pos] = prefix
+        out[pos:pos + AES_NONCE_SIZE] = nonce
+        pos += AES_NONCE_SIZE
+        for i in range(0, size, AES_CHUNK_SIZE):
+            chunk = encryptor.update(json_data[i:i + AES_CHUNK_SIZE])
+            out[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+        encryptor.finalize()
+        out[pos:] = encryptor.tag
+        return out
     except Exception as e:
-        print(f"Encryption Error (AESGCM): {e}")
+        logger.error("Encryption Error (AEAD): %s", e)
         return None
 
 def decrypt_data(encrypted_blob: bytes, master_password: str) -> dict | None:
+    header = bytes(encrypted_blob[:VAULT_HEADER_SIZE])
+    if _is_vault_header(header):
+        decrypted = _decrypt_payload(memoryview(encrypted_blob)[VAULT_HEADER_SIZE:], master_password, header)
+        if decrypted is not None:
+            return decrypted
+    # Legacy PBKDF2 + AES-GCM vault (no header). Also tried when a header-looking
+    # prefix fails, since a legacy salt can start with the same bytes.
+    return _decrypt_payload(encrypted_blob, master_password, b"")
+
+def _decrypt_payload(encrypted_blob: bytes, master_password: str, header: bytes) -> dict | None:
+    decrypted_data = None
+    derived_key = None
     try:
-        salt = encrypted_blob[:SALT_SIZE]
-        nonce = encrypted_blob[SALT_SIZE:SALT_SIZE + AES_NONCE_SIZE]
-        ciphertext_with_tag = encrypted_blob[SALT_SIZE + AES_NONCE_SIZE:]
-        if len(nonce) != AES_NONCE_SIZE or len(salt) != SALT_SIZE:
-             print("Decryption Error: Invalid length for salt or nonce.")
+        # One bounds check up front; slicing the memoryview is zero-copy, so only
+        # the small salt/nonce/tag fields are copied out of the blob.
+        view = memoryview(encrypted_blob)
+        if len(view) < SALT_SIZE + AES_NONCE_SIZE + AES_TAG_SIZE:
+             logger.warning("Decryption Error: Blob too short for salt, nonce and tag.")
              return None
-        derived_key = derive_key(master_password, salt)
-        aesgcm = AESGCM(derived_key)
-        decrypted_data = aesgcm.decrypt(nonce, ciphertext_with_tag, None)
-        return json.loads(decrypted_data.decode('utf-8'))
+        salt = bytes(view[:SALT_SIZE])
+        nonce = bytes(view[SALT_SIZE:SALT_SIZE + AES_NONCE_SIZE])
+        ciphertext_with_tag = view[SALT_SIZE + AES_NONCE_SIZE:]
+        derived_key = derive_key(master_password, salt, header)
+        suite = header[0] if header else VAULT_SUITE_SCRYPT_AESGCM
+        if suite == VAULT_SUITE_SCRYPT_CHACHA20:
+            decrypted_data = _cipher_for(derived_key, suite).decrypt(nonce, ciphertext_with_tag, None)
+            return _load_json(decrypted_data)
+        ciphertext = ciphertext_with_tag[:-AES_TAG_SIZE]
+        tag = bytes(ciphertext_with_tag[-AES_TAG_SIZE:])
+        decryptor = Cipher(_cipher_for(derived_key, suite), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+        decrypted_data = bytearray(len(ciphertext))
+        for i in range(0, len(ciphertext), AES_CHUNK_SIZE):
+            decrypted_data[i:i + AES_CHUNK_SIZE] = decryptor.update(ciphertext[i:i + AES_CHUNK_SIZE])
+        decryptor.finalize() # Raises InvalidTag if the vault was tampered with or the key is wrong
+        return _load_json(decrypted_data)
     except Exception: # Catch more general exceptions for decryption failure (like InvalidTag)
         # print(f"Decryption Error: {e}") # Avoid printing specific crypto errors to user
         return None
+    finally:
+        if isinstance(decrypted_data, bytearray):
+            _wipe(decrypted_data) # Don't leave the plaintext vault lying around on the heap
+        if derived_key is not None:
+            _wipe(derived_key)
+
+def decrypt_vault_file(path: str, master_password: str) -> dict | None:
+    """
+    Decrypts the vault file at path. The file is memory-mapped and the
+    ciphertext is decrypted straight from the mapping, avoiding a full read() copy.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None # mmap can't map an empty file
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with memoryview(mapped) as view:
+            return decrypt_data(view, master_password)
+    finally:
+        mapped.close()
 
-def encrypt_vault(data: dict, master_password: str) -> bytes | None:
+def encrypt_vault(data: dict, master_password: str) -> bytearray | None:
     # ensure_dir is called by MainWindow.save_vault directly on VAULT_DIR
+    derived_key = None
     try:
-        salt = os.urandom(SALT_SIZE)
-        derived_key = derive_key(master_password, salt)
-        nonce_and_ciphertext = encrypt_data(data, derived_key)
-        if nonce_and_ciphertext:
-            return salt + nonce_and_ciphertext
+        header = default_vault_header()
+        salt = _cached_salt_for(master_password, header) or os.urandom(SALT_SIZE)
+        derived_key = derive_key(master_password, salt, header)
+        vault_blob = encrypt_data(data, derived_key, header[0], prefix=header + salt)
+        if vault_blob:
+            return vault_blob
         else:
-            print("Vault Encryption Error: encrypt_data failed.")
+            logger.error("Vault Encryption Error: encrypt_data failed.")
             return None
     except Exception as e:
-         print(f"Vault Encryption Wrapper Error: {e}")
-         return None
\ No newline at end of file
+         logger.error("Vault Encryption Wrapper Error: %s", e)
+         return None
+    finally:
+        if derived_key is not None:
+            _wipe(derived_key)
\ No newline at end of file
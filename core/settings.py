@@ -1,18 +1,36 @@
 import os
 import json
+import logging
+from PyQt5.QtCore import QTimer, QCoreApplication
+from PyQt5.QtGui import QFont
 from constants import (
     SETTINGS_FILE, VAULT_FILE, APP_NAME,
     DEFAULT_LANG, DEFAULT_THEME, DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE,
     DEFAULT_AUTO_LOCK_TIMEOUT
 )
+from .utils import write_file_atomic
 # SETTINGS_FILE is expected at the root where the app is run.
 # This class will use it as is.
 
+logger = logging.getLogger("mindvault")
+
+SAVE_DELAY_MS = 250 # set() calls within this window are written to disk together
+
 class SettingsManager:
     def __init__(self, filename=None):
         self.filename = filename if filename else SETTINGS_FILE
         self.filename = os.path.abspath(self.filename) # Use absolute path
         self.settings = self.load_settings()
+        self._font_cache = None # (family, size, QFont) behind resolved_font()
+
+        self._dirty = False
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
 
     def load_settings(self):
         defaults = {
@@ -24,31 +42,38 @@ class SettingsManager:
             "auto_lock_timeout": DEFAULT_AUTO_LOCK_TIMEOUT,
             "vault_identifier": f"{APP_NAME}Vault"
         }
-        if not os.path.exists(self.filename):
+        # Open directly instead of checking os.path.exists first: one syscall
+        # on the normal path, and VAULT_FILE is only stat'ed when first_run is needed.
+        try:
+            f = open(self.filename, 'r', encoding='utf-8')
+        except FileNotFoundError:
             # Determine first_run based on vault existence if settings file is new
             defaults["first_run"] = not os.path.exists(VAULT_FILE)
             self.save_settings(defaults)
             return defaults
+        except IOError as e:
+            logger.warning("Error loading settings file '%s': %s. Using defaults.", self.filename, e)
+            defaults["first_run"] = not os.path.exists(VAULT_FILE)
+            self.save_settings(defaults)
+            return defaults
         try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
+            with f:
                 loaded_settings = json.load(f)
                 # Ensure all default keys exist
-                for key, value in defaults.items():
-                    loaded_settings.setdefault(key, value)
-                
+                loaded_settings = {**defaults, **loaded_settings}
+
                 # Validate specific settings
-                if loaded_settings.get("theme") not in ["light", "dark"]:
+                if loaded_settings["theme"] not in ("light", "dark"):
                     loaded_settings["theme"] = DEFAULT_THEME
-                if not isinstance(loaded_settings.get("font_size"), int):
-                    loaded_settings["font_size"] = DEFAULT_FONT_SIZE
-                if not isinstance(loaded_settings.get("first_run"), bool):
+                for key in ("font_size", "auto_lock_timeout"):
+                    if type(loaded_settings[key]) is not int: # Exact check, rejects bools too
+                        loaded_settings[key] = defaults[key]
+                if type(loaded_settings["first_run"]) is not bool:
                      # If first_run is corrupted, check vault existence
                      loaded_settings["first_run"] = not os.path.exists(VAULT_FILE)
-                if not isinstance(loaded_settings.get("auto_lock_timeout"), int):
-                    loaded_settings["auto_lock_timeout"] = DEFAULT_AUTO_LOCK_TIMEOUT
                 return loaded_settings
         except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading settings file '{self.filename}': {e}. Using defaults.")
+            logger.warning("Error loading settings file '%s': %s. Using defaults.", self.filename, e)
             # Re-determine first_run if settings are corrupted
             defaults["first_run"] = not os.path.exists(VAULT_FILE)
             self.save_settings(defaults) # Save a clean default file
@@ -57,16 +82,48 @@ class SettingsManager:
     def save_settings(self, settings_data=None):
         if settings_data is None:
             settings_data = self.settings
+        # Serialized up front and written atomically, so a crash or power loss mid-write
+        # never leaves a truncated settings file behind (which load_settings would
+        # "recover" by resetting everything to defaults). Indented: users edit this file.
+        data = json.dumps(settings_data, ensure_ascii=False, indent=4).encode('utf-8')
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(settings_data, f, indent=4, ensure_ascii=False)
+            write_file_atomic(self.filename, data, mode=0o644) # Not secret; keep the old permissions
             self.settings = settings_data # Update internal state
         except IOError as e:
-            print(f"Error saving settings file '{self.filename}': {e}")
+            logger.error("Error saving settings file '%s': %s", self.filename, e)
 
     def get(self, key, default=None):
         return self.settings.get(key, default)
 
+    def resolved_font(self):
+        """
+        Returns a QFont for the font_family/font_size settings. The same QFont is reused
+        while those settings are unchanged, so Qt only resolves the family once.
+        """
+        family = self.get("font_family", DEFAULT_FONT_FAMILY)
+        size = self.get("font_size", DEFAULT_FONT_SIZE)
+        cached = self._font_cache
+        if cached is None or cached[0] != family or cached[1] != size:
+            cached = self._font_cache = (family, size, QFont(family, size))
+        return QFont(cached[2]) # Copy shares the resolved font data; callers may modify it
+
     def set(self, key, value):
+        # Written by flush() once the burst of set() calls is over
         self.settings[key] = value
-        self.save_settings()
\ No newline at end of file
+        self._dirty = True
+        self._save_timer.start()
+
+    def set_many(self, values):
+        """Like set() for several keys at once; does nothing if values is empty."""
+        if not values:
+            return
+        self.settings.update(values)
+        self._dirty = True
+        self._save_timer.start()
+
+    def flush(self):
+        """Writes pending set() changes to disk now."""
+        self._save_timer.stop()
+        if self._dirty:
+            self._dirty = False
+            self.save_settings()
\ No newline at end of file
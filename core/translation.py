@@ -1,96 +1,147 @@
 import os
+import re
 import json
+import logging
+import functools
 from PyQt5.QtCore import Qt, QTranslator, QLocale, QLibraryInfo
 from .utils import ensure_dir # from mindvault.core.utils
 # LANG_DIR will be passed or set based on where the main app runs.
 # Let's make it so that this class uses a lang_dir passed to it.
 
+logger = logging.getLogger("mindvault")
+
+# "_lang_name_" is the first key of every language file, so listing languages
+# only needs the head of each file. Escaped names fall back to a full parse.
+_LANG_NAME_RE = re.compile(rb'"_lang_name_"\s*:\s*"([^"\\]*)"')
+_LANG_NAME_PEEK_SIZE = 1024
+
 class TranslationHandler:
+    # Parsed language files shared by all handlers: {abs_path: (mtime, data)}.
+    # Re-parsed only when the file changes on disk.
+    _lang_cache = {}
+
     def __init__(self, app, initial_lang='en', lang_dir="lang"): # lang_dir relative to CWD
         self.app = app
         self.translator = QTranslator(self.app)
         self.locale = initial_lang
         self.translations = {}
+        self._qt_translators = [] # Qt's own translators currently installed on the app
+        self._qt_locale = None # Locale those translators were loaded for
+        self._available_langs = None # (lang_dir mtime, {code: name}) from the last scan
         self.lang_dir = os.path.abspath(lang_dir) # Ensure it's an absolute path
         ensure_dir(self.lang_dir) # Ensure the lang directory exists
         self.load_language(self.locale)
 
+    def _read_lang_file(self, path):
+        mtime = os.stat(path).st_mtime
+        cached = self._lang_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._lang_cache[path] = (mtime, data)
+        return data
+
+    def _read_lang_name(self, entry):
+        cached = self._lang_cache.get(entry.path)
+        if cached and cached[0] == entry.stat().st_mtime:
+            return cached[1].get("_lang_name_")
+        with open(entry.path, 'rb') as f:
+            match = _LANG_NAME_RE.search(f.read(_LANG_NAME_PEEK_SIZE))
+        if match:
+            return match.group(1).decode('utf-8')
+        return self._read_lang_file(entry.path).get("_lang_name_")
+
     def get_available_languages(self):
         langs = {}
         try:
             # ensure_dir(self.lang_dir) # Already done in __init__
-            for filename in os.listdir(self.lang_dir):
-                if filename.endswith(".json"):
-                    lang_code = filename[:-5]
-                    try:
-                        with open(os.path.join(self.lang_dir, filename), 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            lang_name = data.get("_lang_name_", lang_code.upper())
-                            langs[lang_code] = lang_name
-                    except Exception as e:
-                        print(f"Error loading lang file {filename}: {e}")
-            
-            # Load Qt's own translations
-            qt_translator = QTranslator()
-            qt_locale = QLocale(self.locale) # Use current app locale
-            ts_path = QLibraryInfo.location(QLibraryInfo.TranslationsPath)
-
-            if qt_translator.load(qt_locale, "qt", "_", ts_path):
-                 self.app.installTranslator(qt_translator)
-            else:
-                print(f"Could not load Qt translations for {self.locale} from {ts_path}")
-
-            qt_base_translator = QTranslator()
-            if qt_base_translator.load(qt_locale, "qtbase", "_", ts_path):
-                self.app.installTranslator(qt_base_translator)
-            else:
-                print(f"Could not load QtBase translations for {self.locale} from {ts_path}")
-
+            # Adding, removing or replacing a file bumps the directory mtime, so an
+            # unchanged mtime means the last scan is still valid.
+            dir_mtime = os.stat(self.lang_dir).st_mtime_ns
+            if self._available_langs and self._available_langs[0] == dir_mtime:
+                return dict(self._available_langs[1])
+            with os.scandir(self.lang_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        lang_code = entry.name[:-5]
+                        try:
+                            langs[lang_code] = self._read_lang_name(entry) or lang_code.upper()
+                        except Exception as e:
+                            logger.warning("Error loading lang file %s: %s", entry.name, e)
+            self._available_langs = (dir_mtime, dict(langs))
         except FileNotFoundError:
-            print(f"Language directory '{self.lang_dir}' not found.")
+            logger.warning("Language directory '%s' not found.", self.lang_dir)
         except Exception as e:
-            print(f"Error reading language directory: {e}")
+            logger.warning("Error reading language directory: %s", e)
         return langs
 
+    def install_qt_translators(self, lang_code):
+        # Every installTranslator() broadcasts a LanguageChange event to all widgets,
+        # so only swap Qt's translators when the language actually changes.
+        if lang_code == self._qt_locale:
+            return
+        for old_translator in self._qt_translators:
+            self.app.removeTranslator(old_translator)
+            old_translator.deleteLater()
+        self._qt_translators = []
+        self._qt_locale = lang_code
+
+        # Load Qt's own translations (standard dialog buttons etc.)
+        qt_locale = QLocale(lang_code)
+        ts_path = QLibraryInfo.location(QLibraryInfo.TranslationsPath)
+        for catalog in ("qt", "qtbase"):
+            qt_translator = QTranslator(self.app)
+            if qt_translator.load(qt_locale, catalog, "_", ts_path):
+                self.app.installTranslator(qt_translator)
+                self._qt_translators.append(qt_translator)
+            else:
+                logger.debug("Could not load %s translations for %s from %s", catalog, lang_code, ts_path)
+
     def load_language(self, lang_code):
         lang_file = os.path.join(self.lang_dir, f"{lang_code}.json")
         try:
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                self.translations = json.load(f)
+            self.translations = self._read_lang_file(lang_file)
             self.locale = lang_code
-            print(f"Loaded language: {lang_code}")
+            logger.debug("Loaded language: %s", lang_code)
             if lang_code == 'ar':
                 self.app.setLayoutDirection(Qt.RightToLeft)
             else:
                 self.app.setLayoutDirection(Qt.LeftToRight)
             
-            # Re-attempt to load Qt translations for the new language
-            self.get_available_languages() # This will re-install Qt translators for the new locale
+            self.install_qt_translators(lang_code)
             return True
         except FileNotFoundError:
-            print(f"Translation file not found: {lang_file}")
+            logger.warning("Translation file not found: %s", lang_file)
             self.translations = {} # Fallback to keys
             self.app.setLayoutDirection(Qt.LeftToRight) # Default LTR
             return False
         except json.JSONDecodeError:
-            print(f"Error decoding JSON from: {lang_file}")
+            logger.warning("Error decoding JSON from: %s", lang_file)
             self.translations = {}
             self.app.setLayoutDirection(Qt.LeftToRight)
             return False
         except Exception as e:
-            print(f"Error loading language {lang_code}: {e}")
+            logger.warning("Error loading language %s: %s", lang_code, e)
             self.translations = {}
             self.app.setLayoutDirection(Qt.LeftToRight)
             return False
 
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _fallback_text(key):
+        return key.replace("_", " ").title() # Basic default text from key
+
     def tr(self, key, *args):
-        default_text = key.replace("_", " ").title() # Basic default text from key
-        text = self.translations.get(key, default_text)
+        text = self.translations.get(key)
+        if text is None:
+            text = self._fallback_text(key)
+        if not args or "{" not in text: # Nothing to substitute
+            return text
+        # Formatted results are not cached: some args are secrets (e.g. a reused
+        # password), which must not outlive the dialog that shows them.
         try:
-            if args:
-                return text.format(*args)
-            else:
-                return text
+            return text.format(*args)
         except (IndexError, KeyError, TypeError) as e:
-             print(f"Translation formatting error for key '{key}' with text '{text}' and args {args}: {e}")
-             return text if not args else default_text # Return unformatted text or default if args were expected
\ No newline at end of file
+             logger.warning("Translation formatting error for key '%s' with text '%s' and args %s: %s", key, text, args, e)
+             return self._fallback_text(key) # Args were expected but the text can't take them
\ No newline at end of file
@@ -1,5 +1,26 @@
 import os
 
 def ensure_dir(directory):
-    if not os.path.exists(directory):
-        os.makedirs(directory)
\ No newline at end of file
+    os.makedirs(directory, exist_ok=True) # One mkdir call, and no exists()/makedirs() race
+
+def write_file_atomic(path, data, mode=0o600):
+    """
+    Writes data to path + ".tmp" with unbuffered os.write() calls, fsyncs it and moves it
+    over path, so path is never left half-written. The temp file is created with mode
+    (owner-only by default) and removed again if anything fails.
+    """
+    temp_path = path + ".tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), mode)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):] # os.write may write less than asked
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
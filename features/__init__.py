@@ -1,35 +1,54 @@
 # features/__init__.py
-from .strength_indicator import check_password_strength_util
-from .password_generator import PasswordGeneratorDialog
-from .auto_lock import AutoLockManager
-from .duplicate_checker import (
-    DuplicateCheckerDialog,
-    check_for_duplicate_password,
-    find_all_duplicate_passwords
-)
-from .backup_restore import BackupRestoreHandler
-from .two_factor_auth import ( 
-    TwoFactorSetupDialog,
-    TwoFactorVerifyDialog,
-    verify_totp_code,
-    store_2fa_secret_in_vault,
-    get_2fa_secret_from_vault,
-    is_2fa_enabled
-)
+import importlib
+
+from .strength_indicator import check_password_strength_util, StrengthIndicatorState
+
+# Everything else pulls in PyQt5 widgets (and qrcode/PIL for 2FA), so it is
+# imported on first attribute access instead of at package import (PEP 562).
+_LAZY_ATTRS = {
+    "PasswordGeneratorDialog": ".password_generator",
+    "AutoLockManager": ".auto_lock",
+    "DuplicateCheckerDialog": ".duplicate_checker",
+    "check_for_duplicate_password": ".duplicate_checker",
+    "find_all_duplicate_passwords": ".duplicate_checker",
+    "BackupRestoreHandler": ".backup_restore",
+    "TwoFactorSetupDialog": ".two_factor_auth",
+    "TwoFactorVerifyDialog": ".two_factor_auth",
+    "verify_totp_code": ".two_factor_auth",
+    "store_2fa_secret_in_vault": ".two_factor_auth",
+    "get_2fa_secret_from_vault": ".two_factor_auth",
+    "is_2fa_enabled": ".two_factor_auth",
+    "clear_2fa_caches": ".two_factor_auth",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # Cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 __all__ = [
     "check_password_strength_util",
+    "StrengthIndicatorState",
     "PasswordGeneratorDialog",
     "AutoLockManager",
     "DuplicateCheckerDialog",
     "check_for_duplicate_password",
     "find_all_duplicate_passwords",
     "BackupRestoreHandler",
-    "TwoFactorSetupDialog", 
-    "TwoFactorVerifyDialog", 
-    "verify_totp_code",      
-    "store_2fa_secret_in_vault", 
-    "get_2fa_secret_from_vault", 
-    "is_2fa_enabled"         
+    "TwoFactorSetupDialog",
+    "TwoFactorVerifyDialog",
+    "verify_totp_code",
+    "store_2fa_secret_in_vault",
+    "get_2fa_secret_from_vault",
+    "is_2fa_enabled",
+    "clear_2fa_caches"
 ]
\ No newline at end of file
@@ -1,17 +1,34 @@
 # features/auto_lock.py
-from PyQt5.QtCore import QObject, QTimer, QEvent, QCoreApplication
+import time
+import logging
+from PyQt5.QtCore import QObject, QTimer, QEvent
 from PyQt5.QtWidgets import QApplication
 
+logger = logging.getLogger("mindvault")
+
+# Minimum time between timer restarts. Input events arrive far more often than
+# the auto-lock resolution (minutes) needs; pointer motion is the noisiest.
+RESET_INTERVAL_NS = 500_000_000 # 0.5 s
+MOUSE_MOVE_RESET_INTERVAL_NS = 2_000_000_000 # 2 s
+
+# Non-motion events that count as user activity (checked on every event)
+_USER_EVENTS = frozenset({
+    QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+    QEvent.KeyPress, QEvent.KeyRelease, QEvent.Wheel
+})
+
 class AutoLockManager(QObject):
     def __init__(self, main_window, settings_manager, translator, parent=None):
         super().__init__(parent)
         self.main_window = main_window
         self.settings_manager = settings_manager
         self.translator = translator
+        self._app = QApplication.instance()
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._handle_timeout)
         self.is_active = False
         self.timeout_minutes = 0
+        self._last_reset_ns = 0
         self._load_settings()
 
     def _load_settings(self):
@@ -26,20 +43,25 @@ class AutoLockManager(QObject):
         if self.timeout_minutes > 0:
             self.is_active = True
             self.timer.start()
-            QApplication.instance().installEventFilter(self)
-            print(f"Auto-lock started: {self.timeout_minutes} minutes.")
+            self._last_reset_ns = time.monotonic_ns()
+            self._app.installEventFilter(self)
+            logger.debug("Auto-lock started: %s minutes.", self.timeout_minutes)
 
     def stop(self):
         self.is_active = False
         self.timer.stop()
         try:
-            QApplication.instance().removeEventFilter(self)
+            self._app.removeEventFilter(self)
         except RuntimeError: # Can happen if app is closing
             pass
-        print("Auto-lock stopped.")
+        logger.debug("Auto-lock stopped.")
 
-    def reset_timer(self):
+    def reset_timer(self, min_interval_ns=RESET_INTERVAL_NS):
         if self.is_active and self.timeout_minutes > 0:
+            now = time.monotonic_ns()
+            if now - self._last_reset_ns < min_interval_ns:
+                return # Restarted recently enough
+            self._last_reset_ns = now
             self.timer.start() # Restart with the same interval
 
     def update_settings(self):
@@ -54,16 +76,16 @@ class AutoLockManager(QObject):
 
     def _handle_timeout(self):
         if self.is_active and self.main_window:
-            print("Auto-lock timeout. Locking vault.")
+            logger.info("Auto-lock timeout. Locking vault.")
             self.main_window.status_bar.showMessage(self.translator.tr("status_auto_locked"), 5000)
             self.main_window.lock_vault() # This will also stop the autolock manager via main_window logic
 
     def eventFilter(self, obj, event):
         # Reset timer on user activity
         # Check event types that indicate user activity
-        if event.type() in [
-            QEvent.MouseMove, QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
-            QEvent.KeyPress, QEvent.KeyRelease, QEvent.Wheel
-        ]:
+        event_type = event.type()
+        if event_type == QEvent.MouseMove:
+            self.reset_timer(MOUSE_MOVE_RESET_INTERVAL_NS)
+        elif event_type in _USER_EVENTS:
             self.reset_timer()
-        return super().eventFilter(obj, event)
\ No newline at end of file
+        return False # Never consume the event (same as QObject.eventFilter)
\ No newline at end of file
@@ -5,6 +5,32 @@ from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from datetime import datetime
 
 
+def _fast_copy(src: str, dst: str):
+    """
+    Copies src to dst in-kernel where possible, preserving metadata like shutil.copy2.
+    The data goes to dst + ".tmp" first and is moved over dst only once complete, so a
+    failed copy (or restore) never leaves dst truncated or half-written.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    temp_path = dst + ".tmp"
+    try:
+        with open(src, 'rb') as fsrc, open(temp_path, 'wb') as fdst:
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+            except (OSError, AttributeError): # Not Linux, or unsupported filesystem
+                # copy_file_range advances both offsets, so this resumes where it stopped
+                shutil.copyfileobj(fsrc, fdst, 1 << 20)
+            fdst.flush()
+            os.fsync(fdst.fileno())
+        shutil.copystat(src, temp_path)
+        os.replace(temp_path, dst)
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
+
 class BackupRestoreHandler:
     def __init__(self, vault_file_path: str, translator, parent_widget=None):
         self.vault_file_path = vault_file_path
@@ -36,7 +62,7 @@ class BackupRestoreHandler:
 
         if file_path:
             try:
-                shutil.copy2(self.vault_file_path, file_path) # copy2 preserves metadata
+                _fast_copy(self.vault_file_path, file_path) # Preserves metadata like copy2
                 QMessageBox.information(
                     self.parent_widget,
                     self.translator.tr("info_title"),
@@ -75,7 +101,7 @@ class BackupRestoreHandler:
                     if not os.path.exists(vault_dir):
                         os.makedirs(vault_dir)
                         
-                    shutil.copy2(file_path, self.vault_file_path)
+                    _fast_copy(file_path, self.vault_file_path)
                     QMessageBox.information(
                         self.parent_widget,
                         self.translator.tr("info_title"),
@@ -1,7 +1,7 @@
 # features/duplicate_checker.py
-from collections import defaultdict
+from collections import Counter, defaultdict
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QListWidget, QListWidgetItem,
+    QDialog, QVBoxLayout, QListWidget,
     QDialogButtonBox, QLabel, QMessageBox
 )
 from PyQt5.QtCore import Qt
@@ -11,17 +11,18 @@ def find_all_duplicate_passwords(accounts_list: list) -> dict:
     Finds all passwords used by more than one account.
     Returns: {password: [site_name1, site_name2, ...]}
     """
-    password_map = defaultdict(list)
+    # Count first so site lists are only built for passwords that repeat.
+    counts = Counter(account.get("password") for account in accounts_list)
+    duplicated = {password for password, count in counts.items() if password and count > 1}
+    if not duplicated:
+        return {}
+
+    duplicates = defaultdict(list)
     for account in accounts_list:
         password = account.get("password")
-        site_name = account.get("site", "Unknown")
-        if password: # Only consider accounts with passwords
-            password_map[password].append(site_name)
-
-    duplicates = {
-        password: sites for password, sites in password_map.items() if len(sites) > 1
-    }
-    return duplicates
+        if password in duplicated: # Empty passwords are left out of duplicated above
+            duplicates[password].append(account.get("site", "Unknown"))
+    return dict(duplicates)
 
 def check_for_duplicate_password(new_password: str, current_account_id: str | None,
                                  all_accounts: list, translator) -> bool:
@@ -32,21 +33,22 @@ def check_for_duplicate_password(new_password: str, current_account_id: str | No
     if not new_password: # Empty password is not considered for duplication check here
         return False
 
-    for account in all_accounts:
-        if account.get("id") == current_account_id: # Skip self
-            continue
-        if account.get("password") == new_password:
-            site_names = [acc.get("site", translator.tr("unknown_site")) for acc in all_accounts if acc.get("password") == new_password and acc.get("id") != current_account_id]
+    # Single pass: collect every other account using this password.
+    site_names = [
+        account.get("site", translator.tr("unknown_site")) for account in all_accounts
+        if account.get("password") == new_password and account.get("id") != current_account_id
+    ]
+    if not site_names:
+        return False # Not a duplicate
 
-            reply = QMessageBox.question(
-                None, # No parent needed for a simple warning
-                translator.tr("warning_title"),
-                translator.tr("duplicate_password_save_warning", new_password, "\n - ".join(site_names)),
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No  # Default to No (don't save with duplicate)
-            )
-            return reply == QMessageBox.No # True means user chose "No", so stop saving
-    return False # Not a duplicate or user chose "Yes"
+    reply = QMessageBox.question(
+        None, # No parent needed for a simple warning
+        translator.tr("warning_title"),
+        translator.tr("duplicate_password_save_warning", new_password, "\n - ".join(site_names)),
+        QMessageBox.Yes | QMessageBox.No,
+        QMessageBox.No  # Default to No (don't save with duplicate)
+    )
+    return reply == QMessageBox.No # True means user chose "No", so stop saving
 
 class DuplicateCheckerDialog(QDialog):
     def __init__(self, translator, duplicate_data: dict, parent=None):
@@ -66,18 +68,22 @@ class DuplicateCheckerDialog(QDialog):
             layout.addWidget(label)
 
             self.list_widget = QListWidget()
+            # Build all rows first and insert them in one addItems() call:
+            # header, site details, spacer for each duplicated password.
+            rows = []
             for password, sites in duplicate_data.items():
                 # Mask part of the password for display
                 masked_password = password[:3] + "****" + password[-2:] if len(password) > 5 else password
-                item_text = self.translator.tr("password_display_mask", masked_password)
-                item = QListWidgetItem(item_text)
-                self.list_widget.addItem(item)
-                
-                sites_text = "\n".join([f"  - {site}" for site in sites])
-                details_item = QListWidgetItem(sites_text)
-                details_item.setFlags(details_item.flags() & ~Qt.ItemIsSelectable) # Not selectable
-                self.list_widget.addItem(details_item)
-                self.list_widget.addItem("") # Spacer
+                rows.append(self.translator.tr("password_display_mask", masked_password))
+                rows.append("\n".join([f"  - {site}" for site in sites]))
+                rows.append("") # Spacer
+
+            self.list_widget.setUpdatesEnabled(False)
+            self.list_widget.addItems(rows)
+            for row in range(1, len(rows), 3): # Site details rows are not selectable
+                details_item = self.list_widget.item(row)
+                details_item.setFlags(details_item.flags() & ~Qt.ItemIsSelectable)
+            self.list_widget.setUpdatesEnabled(True)
 
             layout.addWidget(self.list_widget)
 
@@ -5,7 +5,60 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit, QCheckBox,
     QPushButton, QHBoxLayout, QLabel, QSpinBox, QMessageBox, QApplication
 )
-from PyQt5.QtCore import Qt
+
+# Character pools in checkbox order: uppercase, lowercase, digits, symbols.
+# Bit i of a selection mask means POOLS[i] is selected. All ASCII, so kept as
+# bytes and the password is assembled in a bytearray.
+POOLS = tuple(pool.encode("ascii") for pool in
+              (string.ascii_uppercase, string.ascii_lowercase, string.digits, string.punctuation))
+# Per selection mask: the selected pools, and their concatenation.
+SELECTED_POOLS = {
+    mask: tuple(pool for i, pool in enumerate(POOLS) if mask & (1 << i))
+    for mask in range(1 << len(POOLS))
+}
+CHARSETS = {mask: b"".join(pools) for mask, pools in SELECTED_POOLS.items()}
+MIN_PASSWORD_LENGTH = 8
+
+
+def _sample_chars(character_set: bytes, count: int) -> bytearray:
+    """
+    Draws count uniformly random characters from character_set (at most 256 long).
+    Random bytes are fetched in bulk with secrets.token_bytes and masked to the
+    next power of two; values outside the set are rejected to keep it unbiased.
+    """
+    n = len(character_set)
+    mask = (1 << (n - 1).bit_length()) - 1
+    chars = bytearray()
+    while len(chars) < count:
+        # Acceptance rate is > 50%, so ask for twice the shortfall plus slack
+        for b in secrets.token_bytes(2 * (count - len(chars)) + 16):
+            index = b & mask
+            if index < n:
+                chars.append(character_set[index]) # bytes index is an int: no str objects
+                if len(chars) == count:
+                    break
+    return chars
+
+
+def _shuffle(buf: bytearray):
+    """
+    In-place Fisher-Yates shuffle of buf (at most 256 long).
+    Swap indices come from one pool of random bytes, with the same mask-and-reject
+    scheme as _sample_chars; the pool is topped up only if rejections drain it.
+    """
+    pool = secrets.token_bytes(2 * len(buf) + 16)
+    pos = 0
+    for i in range(len(buf) - 1, 0, -1):
+        mask = (1 << i.bit_length()) - 1
+        while True:
+            if pos == len(pool):
+                pool, pos = secrets.token_bytes(2 * i + 16), 0
+            j = pool[pos] & mask
+            pos += 1
+            if j <= i:
+                break
+        buf[i], buf[j] = buf[j], buf[i]
+
 
 class PasswordGeneratorDialog(QDialog):
     def __init__(self, translator, parent=None):
@@ -20,7 +73,7 @@ class PasswordGeneratorDialog(QDialog):
         form_layout = QFormLayout()
 
         self.length_spinbox = QSpinBox()
-        self.length_spinbox.setRange(8, 128)
+        self.length_spinbox.setRange(MIN_PASSWORD_LENGTH, 128)
         self.length_spinbox.setValue(16)
         form_layout.addRow(self.translator.tr("length_label"), self.length_spinbox)
 
@@ -42,6 +95,11 @@ class PasswordGeneratorDialog(QDialog):
 
         layout.addLayout(form_layout)
 
+        # One character per selected class is required, so keep the length feasible up front
+        for checkbox in (self.uppercase_checkbox, self.lowercase_checkbox,
+                         self.digits_checkbox, self.symbols_checkbox):
+            checkbox.toggled.connect(self._update_min_length)
+
         self.password_display_edit = QLineEdit()
         self.password_display_edit.setReadOnly(True)
         self.password_display_edit.setPlaceholderText(self.translator.tr("generated_password_placeholder"))
@@ -74,22 +132,21 @@ class PasswordGeneratorDialog(QDialog):
 
         self.generate_and_display_password() # Generate one on open
 
+    def _selection_mask(self):
+        """Checkbox states folded into a POOLS bit mask (bit order matches POOLS)."""
+        return (self.uppercase_checkbox.isChecked()
+                | self.lowercase_checkbox.isChecked() << 1
+                | self.digits_checkbox.isChecked() << 2
+                | self.symbols_checkbox.isChecked() << 3)
+
+    def _update_min_length(self):
+        required = len(SELECTED_POOLS[self._selection_mask()])
+        self.length_spinbox.setMinimum(max(MIN_PASSWORD_LENGTH, required))
+
     def generate_and_display_password(self):
         length = self.length_spinbox.value()
-        use_uppercase = self.uppercase_checkbox.isChecked()
-        use_lowercase = self.lowercase_checkbox.isChecked()
-        use_digits = self.digits_checkbox.isChecked()
-        use_symbols = self.symbols_checkbox.isChecked()
-
-        character_set = ""
-        if use_uppercase:
-            character_set += string.ascii_uppercase
-        if use_lowercase:
-            character_set += string.ascii_lowercase
-        if use_digits:
-            character_set += string.digits
-        if use_symbols:
-            character_set += string.punctuation
+        mask = self._selection_mask()
+        character_set = CHARSETS[mask]
 
         if not character_set:
             QMessageBox.warning(self, self.translator.tr("error_title"),
@@ -102,28 +159,13 @@ class PasswordGeneratorDialog(QDialog):
 
         # Ensure password meets criteria if possible (at least one of each selected type)
         # This is a bit more complex for truly random, but a good practice
-        password_list = []
-        if use_uppercase: password_list.append(secrets.choice(string.ascii_uppercase))
-        if use_lowercase: password_list.append(secrets.choice(string.ascii_lowercase))
-        if use_digits: password_list.append(secrets.choice(string.digits))
-        if use_symbols: password_list.append(secrets.choice(string.punctuation))
+        password = bytearray(secrets.choice(pool) for pool in SELECTED_POOLS[mask])
         
-        remaining_length = length - len(password_list)
-        if remaining_length < 0: # If length is too small for selected criteria
-             QMessageBox.warning(self, self.translator.tr("error_title"),
-                                 self.translator.tr("generator_length_too_short_for_criteria"))
-             self.generated_password = ""
-             self.password_display_edit.setText("")
-             self.copy_button.setEnabled(False)
-             self.use_button.setEnabled(False)
-             return
-
-
-        for _ in range(remaining_length):
-            password_list.append(secrets.choice(character_set))
-
-        secrets.SystemRandom().shuffle(password_list) # Shuffle to make it random
-        self.generated_password = "".join(password_list)
+        remaining_length = length - len(password) # >= 0, the spinbox minimum covers the seeds
+        password += _sample_chars(character_set, remaining_length)
+
+        _shuffle(password) # Shuffle so the required characters aren't always up front
+        self.generated_password = password.decode("ascii")
         self.password_display_edit.setText(self.generated_password)
         self.copy_button.setEnabled(True)
         self.use_button.setEnabled(True)
@@ -1,31 +1,128 @@
 # features/strength_indicator.py
+import math
+
+# Character class bits
+CLASS_UPPER = 1
+CLASS_LOWER = 2
+CLASS_DIGIT = 4
+CLASS_SYMBOL = 8
+CLASS_OTHER_LETTER = 16 # Letters without case (Arabic, CJK, ...)
+CLASS_ALL = CLASS_UPPER | CLASS_LOWER | CLASS_DIGIT | CLASS_SYMBOL | CLASS_OTHER_LETTER
+
+
+def _char_class(c: str) -> int:
+    flags = 0
+    if c.isupper(): flags |= CLASS_UPPER
+    elif c.islower(): flags |= CLASS_LOWER
+    elif c.isalpha(): flags |= CLASS_OTHER_LETTER
+    if c.isdigit(): flags |= CLASS_DIGIT
+    if not c.isalnum(): flags |= CLASS_SYMBOL
+    return flags
+
+
+# Precomputed classes for printable ASCII; anything else is classified on the fly.
+_ASCII_CLASSES = {chr(code): _char_class(chr(code)) for code in range(128)}
+# The same as a bytes.translate() table: byte value -> class bits (upper half unused)
+_ASCII_CLASS_TABLE = bytes(_ASCII_CLASSES[chr(code)] if code < 128 else 0 for code in range(256))
+
+
+# Pool size contributed by each class, and log2 of the pool size for every
+# combination of class bits, so scoring needs no per-call log().
+# Caseless letters count as a 28-letter pool (the Arabic alphabet), a conservative
+# figure for scripts that have far more.
+_CLASS_POOL_SIZES = ((CLASS_UPPER, 26), (CLASS_LOWER, 26), (CLASS_DIGIT, 10), (CLASS_SYMBOL, 32),
+                     (CLASS_OTHER_LETTER, 28))
+_LOG2_POOL = {}
+for _flags in range(CLASS_ALL + 1):
+    _pool = sum(size for bit, size in _CLASS_POOL_SIZES if _flags & bit)
+    _LOG2_POOL[_flags] = math.log2(_pool) if _pool else 0.0
+del _flags, _pool
+
+# Entropy thresholds in bits (lower bound of each band)
+ENTROPY_WEAK = 28
+ENTROPY_MEDIUM = 60
+ENTROPY_STRONG = 128
+
+
+def classify_password(password: str) -> int:
+    """Returns the OR of the CLASS_* bits of every character in password."""
+    flags = 0
+    if password.isascii():
+        # translate() maps every byte to its class bits and set() dedupes them, both
+        # in C, so this loop only sees at most 4 distinct values.
+        for char_flags in set(password.encode("ascii").translate(_ASCII_CLASS_TABLE)):
+            flags |= char_flags
+        return flags
+    # set() dedupes in C, so the Python loop only sees each distinct character once
+    for c in set(password):
+        char_flags = _ASCII_CLASSES.get(c)
+        flags |= _char_class(c) if char_flags is None else char_flags
+        if flags == CLASS_ALL: # Nothing left to discover; entropy only needs len()
+            break
+    return flags
+
+
+def _strength_for(length: int, flags: int, translator):
+    if length == 0: # Handle empty password case specifically
+        return translator.tr("password_strength_very_weak"), "color: grey;"
+
+    # Entropy estimate E = L * log2(N), N being the size of the character pools in use
+    entropy_bits = length * _LOG2_POOL[flags]
+
+    if entropy_bits >= ENTROPY_STRONG:
+        return translator.tr("password_strength_strong"), "color: green;"
+    elif entropy_bits >= ENTROPY_MEDIUM:
+        return translator.tr("password_strength_medium"), "color: orange;"
+    elif entropy_bits >= ENTROPY_WEAK:
+        return translator.tr("password_strength_weak"), "color: red;"
+    else: # Below ENTROPY_WEAK (and not empty)
+        return translator.tr("password_strength_very_weak"), "color: darkred;"
+
+
 def check_password_strength_util(password: str, translator):
     """
     Calculates password strength and returns text and color.
     Returns: (strength_text: str, style_sheet_color: str)
     """
-    length = len(password)
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_symbol = any(not c.isalnum() for c in password)
-    score = 0
+    return _strength_for(len(password), classify_password(password) if password else 0, translator)
 
-    if length == 0: # Handle empty password case specifically
-        return translator.tr("password_strength_very_weak"), "color: grey;"
 
+class StrengthIndicatorState:
+    """
+    Incremental version of check_password_strength_util for a field being typed into.
+    Keeps a per-class character count so an edit that only appends to or trims the
+    end of the previous text classifies just the changed characters; anything else
+    (paste in the middle, select-and-replace) falls back to a full rescan.
+    """
+    _CLASS_BITS = (CLASS_UPPER, CLASS_LOWER, CLASS_DIGIT, CLASS_SYMBOL, CLASS_OTHER_LETTER)
 
-    if length >= 8: score += 1
-    if length >= 12: score += 1
-    if has_upper and has_lower: score += 1
-    if has_digit: score += 1
-    if has_symbol: score += 1
+    def __init__(self):
+        self.text = ""
+        self.counts = [0] * len(self._CLASS_BITS)
 
-    if score >= 4: # 4 or 5
-        return translator.tr("password_strength_strong"), "color: green;"
-    elif score == 3:
-        return translator.tr("password_strength_medium"), "color: orange;"
-    elif score == 2:
-        return translator.tr("password_strength_weak"), "color: red;"
-    else: # 0 or 1 (and not empty)
-        return translator.tr("password_strength_very_weak"), "color: darkred;"
\ No newline at end of file
+    @property
+    def flags(self) -> int:
+        return sum(bit for bit, count in zip(self._CLASS_BITS, self.counts) if count)
+
+    def _count(self, chars: str, delta: int):
+        counts = self.counts
+        for c in chars:
+            char_flags = _ASCII_CLASSES.get(c)
+            if char_flags is None:
+                char_flags = _char_class(c)
+            for i, bit in enumerate(self._CLASS_BITS):
+                if char_flags & bit:
+                    counts[i] += delta
+
+    def update(self, text: str, translator):
+        """Moves the state to text and returns (strength_text, style_sheet_color)."""
+        previous = self.text
+        if text.startswith(previous):
+            self._count(text[len(previous):], 1)
+        elif previous.startswith(text):
+            self._count(previous[len(text):], -1)
+        else:
+            self.counts = [0] * len(self._CLASS_BITS)
+            self._count(text, 1)
+        self.text = text
+        return _strength_for(len(text), self.flags, translator)
@@ -1,14 +1,99 @@
 # features/two_factor_auth.py
-import os
 import base64
-import qrcode
-import pyotp
+import binascii
+import functools
+import hmac
+import secrets
+import struct
+import time
+from urllib.parse import quote
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QMessageBox, QCheckBox, QScrollArea, QWidget, QApplication, QSizePolicy, QDialogButtonBox
+    QMessageBox, QApplication, QDialogButtonBox
 )
-from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QImage, QRegExpValidator
+from PyQt5.QtCore import Qt, QRegExp
+
+QR_DISPLAY_SIZE = 200 # px
+TOTP_DIGITS = 6
+TOTP_INTERVAL = 30 # seconds
+
+
+def _is_plausible_code(code: str) -> bool:
+    """Cheap format check so malformed codes never reach the HMAC."""
+    # isdigit() alone also accepts non-ASCII digits (e.g. Arabic-Indic), which can't be encoded to ASCII
+    return len(code) == TOTP_DIGITS and code.isascii() and code.isdigit()
+
+
+@functools.lru_cache(maxsize=8)
+def _decode_secret(secret_key: str) -> bytes:
+    """Base32-decodes a TOTP secret once; authenticator-style secrets may omit the padding."""
+    return base64.b32decode(secret_key + "=" * (-len(secret_key) % 8), casefold=True)
+
+
+def clear_2fa_caches():
+    """Drops the cached decoded secrets and QR images, e.g. when the vault is locked."""
+    _decode_secret.cache_clear()
+    _render_qr_image.cache_clear()
+
+
+def _random_secret() -> str:
+    """160-bit random secret (RFC 4226 recommended length), base32 without padding."""
+    return base64.b32encode(secrets.token_bytes(20)).decode("ascii")
+
+
+def _provisioning_uri(secret_key: str, name: str, issuer: str) -> str:
+    """otpauth:// URI understood by authenticator apps (Key Uri Format)."""
+    issuer_quoted = quote(issuer, safe="")
+    return (f"otpauth://totp/{issuer_quoted}:{quote(name, safe='')}"
+            f"?secret={secret_key}&issuer={issuer_quoted}")
+
+
+def _totp_at(key: bytes, step: int) -> bytes:
+    """RFC 6238 code (HMAC-SHA1, dynamic truncation) for a time step, as ASCII digits."""
+    digest = hmac.new(key, struct.pack(">Q", step), "sha1").digest()
+    offset = digest[-1] & 0x0F
+    value = (struct.unpack_from(">I", digest, offset)[0] & 0x7FFFFFFF) % 10 ** TOTP_DIGITS
+    return b"%0*d" % (TOTP_DIGITS, value)
+
+
+def _verify_code(key: bytes, code: str) -> bool:
+    """
+    Checks code against the previous, current and next time step, to tolerate clock
+    drift between this machine and the authenticator app. Every step is compared in
+    constant time and none is skipped, so timing doesn't leak which one matched.
+    """
+    code_bytes = code.encode("ascii")
+    now_step = int(time.time()) // TOTP_INTERVAL
+    matched = False
+    for step in (now_step - 1, now_step, now_step + 1):
+        matched |= hmac.compare_digest(_totp_at(key, step), code_bytes)
+    return matched
+
+
+@functools.lru_cache(maxsize=32)
+def _render_qr_image(data: str) -> QImage:
+    """
+    Renders data as a QR code entirely in memory, already scaled for display.
+    Cached so re-opening the setup dialog for the same secret skips both the QR encode
+    and the scaling. A QImage (not a QPixmap) is cached since it doesn't depend on the
+    GUI being alive.
+    """
+    import qrcode # Deferred: pulls in PIL, and login only needs the TOTP check
+    qr = qrcode.QRCode(border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix() # Rows of booleans (True = dark), quiet zone included
+    size = len(matrix)
+    pixels = b"".join(bytes(0 if dark else 255 for dark in row) for row in matrix)
+    # bytesPerLine is passed explicitly since rows aren't 32-bit aligned. The image only
+    # wraps pixels, which is freed on return, hence the copy() below.
+    image = QImage(pixels, size, size, size, QImage.Format_Grayscale8)
+    # Integer multiple of the module count so every module stays square and sharp;
+    # nearest-neighbour is exact for that, no filtering needed.
+    display_size = max(1, QR_DISPLAY_SIZE // size) * size
+    # scaled() hands back a shallow copy (still over pixels) when the size is unchanged
+    return image.scaled(display_size, display_size, Qt.KeepAspectRatio, Qt.FastTransformation).copy()
 
 
 class TwoFactorSetupDialog(QDialog):
@@ -20,8 +105,9 @@ class TwoFactorSetupDialog(QDialog):
         self.setWindowTitle(self.translator.tr("2fa_setup_title"))
         self.setMinimumWidth(450)
 
-        self.secret_key = existing_secret or pyotp.random_base32()
-        self.totp = pyotp.TOTP(self.secret_key)
+        self.secret_key = existing_secret or _random_secret()
+        # Deterministic for (secret, username, app name); built once and used as the QR cache key
+        self._uri = _provisioning_uri(self.secret_key, self.username_for_issuer, self.app_name)
 
         layout = QVBoxLayout(self)
 
@@ -32,8 +118,15 @@ class TwoFactorSetupDialog(QDialog):
         
         self.qr_label = QLabel()
         self.qr_label.setAlignment(Qt.AlignCenter)
-        self.generate_qr_code()
         layout.addWidget(self.qr_label)
+        if existing_secret is None: # New enrollment: the QR is what the user is here for
+            self.generate_qr_code()
+        else: # Already enrolled: only render the QR if asked to
+            self.qr_label.setText(self.translator.tr("2fa_show_qr_hint"))
+            self.qr_label.setWordWrap(True)
+            self.show_qr_button = QPushButton(self.translator.tr("2fa_show_qr_button"))
+            self.show_qr_button.clicked.connect(self.show_qr_code)
+            layout.addWidget(self.show_qr_button)
 
         
         secret_key_layout = QHBoxLayout()
@@ -52,6 +145,8 @@ class TwoFactorSetupDialog(QDialog):
         self.code_edit = QLineEdit()
         self.code_edit.setPlaceholderText("000000")
         self.code_edit.setMaxLength(6)
+        # ASCII digits only, enforced by Qt as the user types
+        self.code_edit.setValidator(QRegExpValidator(QRegExp(r"[0-9]{0,6}"), self.code_edit))
         layout.addWidget(self.code_edit)
 
         self.verify_button = QPushButton(self.translator.tr("2fa_verify_and_enable_button"))
@@ -63,20 +158,13 @@ class TwoFactorSetupDialog(QDialog):
         layout.addWidget(self.cancel_button)
 
     def generate_qr_code(self):
-        provisioning_uri = self.totp.provisioning_uri(
-            name=self.username_for_issuer, 
-            issuer_name=self.app_name
-        )
-        img = qrcode.make(provisioning_uri)
-        
-        qr_img_path = "temp_qr.png" 
-        img.save(qr_img_path)
-        pixmap = QPixmap(qr_img_path)
-        if os.path.exists(qr_img_path):
-            os.remove(qr_img_path)
+        self._qr_pixmap = QPixmap.fromImage(_render_qr_image(self._uri))
+        self.qr_label.setPixmap(self._qr_pixmap)
 
-        self.qr_label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
+    def show_qr_code(self):
+        self.show_qr_button.hide()
+        self.generate_qr_code()
 
     def copy_secret_key_to_clipboard(self):
         QApplication.clipboard().setText(self.secret_key)
@@ -85,11 +173,11 @@ class TwoFactorSetupDialog(QDialog):
 
     def verify_and_accept(self):
         entered_code = self.code_edit.text().strip()
-        if not entered_code.isdigit() or len(entered_code) != 6:
-            QMessageBox.warning(self, self.translator.tr("error_title"), self.translator.tr("2fa_invalid_code_format"))
+        if not _is_plausible_code(entered_code): # Validator only allows digits, so it's just too short
+            self.code_edit.setFocus()
             return
 
-        if self.totp.verify(entered_code):
+        if _verify_code(_decode_secret(self.secret_key), entered_code):
             QMessageBox.information(self, self.translator.tr("info_title"), self.translator.tr("2fa_enabled_success"))
             self.accept()
         else:
@@ -111,6 +199,8 @@ class TwoFactorVerifyDialog(QDialog):
         self.code_edit = QLineEdit()
         self.code_edit.setPlaceholderText("000000")
         self.code_edit.setMaxLength(6)
+        # ASCII digits only, enforced by Qt as the user types
+        self.code_edit.setValidator(QRegExpValidator(QRegExp(r"[0-9]{0,6}"), self.code_edit))
         layout.addWidget(self.code_edit)
         self.code_edit.returnPressed.connect(self.accept)
 
@@ -131,10 +221,13 @@ class TwoFactorVerifyDialog(QDialog):
 
 def verify_totp_code(secret_key: str, code: str) -> bool:
     """Verifies a TOTP code against a secret key."""
-    if not secret_key or not code:
+    if not secret_key or not code or not _is_plausible_code(code):
+        return False
+    try:
+        key = _decode_secret(secret_key)
+    except binascii.Error: # Not valid base32
         return False
-    totp = pyotp.TOTP(secret_key)
-    return totp.verify(code)
+    return _verify_code(key, code)
 
 
 def store_2fa_secret_in_vault(vault_data: dict, secret: str | None):
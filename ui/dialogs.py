@@ -1,23 +1,33 @@
-import os
-import base64
+import secrets
 from PyQt5.QtWidgets import (
     QDialog, QFormLayout, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
-    QMessageBox, QDialogButtonBox, QLabel, QFontDialog, QComboBox, QCheckBox
+    QMessageBox, QDialogButtonBox, QLabel, QFontDialog, QComboBox, QCheckBox, QProgressDialog,
+    QApplication
 )
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QTimer, QThread, QEventLoop
 
 from constants import APP_NAME, DEFAULT_AUTO_LOCK_TIMEOUT 
 from features import (
     check_password_strength_util,
+    StrengthIndicatorState,
     PasswordGeneratorDialog,
     check_for_duplicate_password,
     TwoFactorSetupDialog,
-    TwoFactorVerifyDialog,
     store_2fa_secret_in_vault,
     is_2fa_enabled
 )
 
+STRENGTH_UPDATE_DELAY_MS = 80 # Coalesce keystrokes before re-scoring the password
+
+
+def _make_debounce_timer(parent, slot):
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(STRENGTH_UPDATE_DELAY_MS)
+    timer.timeout.connect(slot)
+    return timer
+
 
 class AccountDialog(QDialog):
     def __init__(self, translator, account_data=None, all_accounts_data=None, parent=None):
@@ -38,7 +48,11 @@ class AccountDialog(QDialog):
         password_inner_layout = QHBoxLayout()
         self.password_edit = QLineEdit(self.account_data.get("password", ""))
         self.password_edit.setEchoMode(QLineEdit.Password)
-        self.password_edit.textChanged.connect(self._update_password_strength_indicator)
+        self._strength_state = StrengthIndicatorState()
+        self._shown_strength = None # (text, style sheet) currently on the label
+        self._strength_timer = _make_debounce_timer(
+            self, lambda: self._update_password_strength_indicator(self.password_edit.text()))
+        self.password_edit.textChanged.connect(self._strength_timer.start)
         
         self.show_password_button = QPushButton(self.translator.tr("show_password"))
         self.show_password_button.setCheckable(True)
@@ -76,7 +90,11 @@ class AccountDialog(QDialog):
 
     def _update_password_strength_indicator(self, password_text):
         if not hasattr(self, 'password_strength_label'): return # Widget might not be fully initialized
-        strength_text, style_sheet = check_password_strength_util(password_text, self.translator)
+        strength = self._strength_state.update(password_text, self.translator)
+        if strength == self._shown_strength: # Same band as before: skip the restyle
+            return
+        self._shown_strength = strength
+        strength_text, style_sheet = strength
         self.password_strength_label.setText(f"{self.translator.tr('password_strength_label')} {strength_text}")
         self.password_strength_label.setStyleSheet(style_sheet)
 
@@ -85,6 +103,7 @@ class AccountDialog(QDialog):
         generated_pwd = PasswordGeneratorDialog.generate_password(self.translator, self)
         if generated_pwd:
             self.password_edit.setText(generated_pwd)
+            self._strength_timer.stop() # Already up to date, no need for the delayed re-check
             self._update_password_strength_indicator(generated_pwd) # Update strength for generated password
 
     def toggle_password_visibility(self, checked):
@@ -120,8 +139,9 @@ class AccountDialog(QDialog):
         password = self.password_edit.text()
         notes = self.notes_edit.text().strip()
         
-        # Generate a unique ID if it's a new account
-        account_id = self.account_data.get("id", base64.urlsafe_b64encode(os.urandom(9)).decode('utf-8'))
+        # Generate a unique ID if it's a new account (only then: a .get() default
+        # would be evaluated on every edit too). Same 12-char URL-safe format as before.
+        account_id = self.account_data.get("id") or secrets.token_urlsafe(9)
         
         return {"site": site, "username": username, "password": password, "notes": notes, "id": account_id}
 
@@ -137,11 +157,12 @@ class SettingsDialog(QDialog):
     def __init__(self, translator, settings_manager, available_languages, main_window_ref, parent=None):
         super().__init__(parent)
         self.translator = translator
+        tr = self.translator.tr # Bound once; the layout below does a few dozen lookups
         self.settings_manager = settings_manager
         self.available_languages = available_languages
         self.main_window_ref = main_window_ref # Reference to MainWindow for vault access
 
-        self.setWindowTitle(self.translator.tr("settings_title"))
+        self.setWindowTitle(tr("settings_title"))
         self.setMinimumWidth(450) 
 
         layout = QVBoxLayout(self)
@@ -151,48 +172,53 @@ class SettingsDialog(QDialog):
         self.lang_combo = QComboBox()
         current_lang_code = self.settings_manager.get("language")
         sorted_langs = sorted(self.available_languages.items(), key=lambda item: item[1]) # Sort by name
+        # Built as a model and inserted in one go, instead of one addItem() (and its
+        # row-insert signals) per language
+        lang_model = QStandardItemModel(self.lang_combo)
         current_lang_idx = 0
+        lang_items = []
         for i, (code, name) in enumerate(sorted_langs):
-            self.lang_combo.addItem(f"{name} ({code})", code) # Display "Name (code)", store code
+            item = QStandardItem(f"{name} ({code})") # Display "Name (code)", store code
+            item.setData(code, Qt.UserRole)
+            lang_items.append(item)
             if code == current_lang_code:
                 current_lang_idx = i
+        lang_model.invisibleRootItem().appendRows(lang_items)
+        self.lang_combo.setModel(lang_model)
         self.lang_combo.setCurrentIndex(current_lang_idx)
-        form_layout.addRow(self.translator.tr("language_label"), self.lang_combo)
+        form_layout.addRow(tr("language_label"), self.lang_combo)
 
         # Theme Selection
         self.theme_combo = QComboBox()
-        self.theme_combo.addItem(self.translator.tr("theme_light"), "light")
-        self.theme_combo.addItem(self.translator.tr("theme_dark"), "dark")
+        self.theme_combo.addItem(tr("theme_light"), "light")
+        self.theme_combo.addItem(tr("theme_dark"), "dark")
         current_theme = self.settings_manager.get("theme")
         self.theme_combo.setCurrentIndex(0 if current_theme == "light" else 1)
-        form_layout.addRow(self.translator.tr("theme_label"), self.theme_combo)
+        form_layout.addRow(tr("theme_label"), self.theme_combo)
 
         # Font Selection
         font_layout = QHBoxLayout()
-        current_font = QFont(
-            self.settings_manager.get("font_family"),
-            self.settings_manager.get("font_size")
-        )
+        current_font = self.settings_manager.resolved_font()
         self.selected_font = current_font # Store the QFont object
         self.font_label = QLabel(f"{current_font.family()}, {current_font.pointSize()}pt")
         self.font_label.setFont(current_font)
-        self.font_button = QPushButton(self.translator.tr("select_font_button"))
+        self.font_button = QPushButton(tr("select_font_button"))
         self.font_button.clicked.connect(self.select_font)
         font_layout.addWidget(self.font_label, 1) # Label takes expanding space
         font_layout.addWidget(self.font_button)
-        form_layout.addRow(self.translator.tr("font_label"), font_layout)
+        form_layout.addRow(tr("font_label"), font_layout)
 
         # Auto-lock Timeout
         self.auto_lock_combo = QComboBox()
         # Values are in minutes, 0 means disabled
         self.auto_lock_timeouts = { 
-            self.translator.tr("auto_lock_disabled"): 0,
-            "1 " + self.translator.tr("auto_lock_minutes_suffix", 1): 1,
-            "5 " + self.translator.tr("auto_lock_minutes_suffix", 5): 5,
-            "10 " + self.translator.tr("auto_lock_minutes_suffix", 10): 10,
-            "15 " + self.translator.tr("auto_lock_minutes_suffix", 15): 15,
-            "30 " + self.translator.tr("auto_lock_minutes_suffix", 30): 30,
-            "60 " + self.translator.tr("auto_lock_minutes_suffix", 60): 60,
+            tr("auto_lock_disabled"): 0,
+            "1 " + tr("auto_lock_minutes_suffix", 1): 1,
+            "5 " + tr("auto_lock_minutes_suffix", 5): 5,
+            "10 " + tr("auto_lock_minutes_suffix", 10): 10,
+            "15 " + tr("auto_lock_minutes_suffix", 15): 15,
+            "30 " + tr("auto_lock_minutes_suffix", 30): 30,
+            "60 " + tr("auto_lock_minutes_suffix", 60): 60,
         }
         current_timeout_val = self.settings_manager.get("auto_lock_timeout", DEFAULT_AUTO_LOCK_TIMEOUT)
         current_timeout_idx = 0
@@ -203,16 +229,16 @@ class SettingsDialog(QDialog):
                 current_timeout_idx = idx
             idx += 1
         self.auto_lock_combo.setCurrentIndex(current_timeout_idx)
-        form_layout.addRow(self.translator.tr("auto_lock_settings_label"), self.auto_lock_combo)
+        form_layout.addRow(tr("auto_lock_settings_label"), self.auto_lock_combo)
 
         # 2FA Setting
-        self.enable_2fa_checkbox = QCheckBox(self.translator.tr("enable_2fa_checkbox_label"))
+        self.enable_2fa_checkbox = QCheckBox(tr("enable_2fa_checkbox_label"))
         if self.main_window_ref and self.main_window_ref.master_key_string:
             # Check current 2FA status from vault_data in main_window_ref
             self.enable_2fa_checkbox.setChecked(is_2fa_enabled(self.main_window_ref.vault_data))
         else:
             self.enable_2fa_checkbox.setEnabled(False) # Cannot change 2FA if vault is locked
-            self.enable_2fa_checkbox.setToolTip(self.translator.tr("unlock_vault_first"))
+            self.enable_2fa_checkbox.setToolTip(tr("unlock_vault_first"))
         
         # Connect stateChanged *after* setting initial state to avoid premature trigger
         self.enable_2fa_checkbox.stateChanged.connect(self.handle_2fa_state_change)
@@ -222,8 +248,8 @@ class SettingsDialog(QDialog):
 
         self.button_box = QDialogButtonBox(
              QDialogButtonBox.Ok | QDialogButtonBox.Cancel, Qt.Horizontal, self)
-        self.button_box.button(QDialogButtonBox.Ok).setText(self.translator.tr("ok_button"))
-        self.button_box.button(QDialogButtonBox.Cancel).setText(self.translator.tr("cancel_button"))
+        self.button_box.button(QDialogButtonBox.Ok).setText(tr("ok_button"))
+        self.button_box.button(QDialogButtonBox.Cancel).setText(tr("cancel_button"))
         
         self.button_box.accepted.connect(self.apply_settings_and_accept)
         self.button_box.rejected.connect(self.reject)
@@ -238,8 +264,16 @@ class SettingsDialog(QDialog):
         # The checkbox state reflects the vault's state.
 
     def select_font(self):
-        font, ok = QFontDialog.getFont(self.selected_font, self, self.translator.tr("select_font_dialog_title"))
-        if ok:
+        # Building the dialog enumerates the installed font families (slow on the first
+        # use with many fonts), so show a busy cursor only for that part, not while it is open
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            font_dialog = QFontDialog(self.selected_font, self)
+        finally:
+            QApplication.restoreOverrideCursor()
+        font_dialog.setWindowTitle(self.translator.tr("select_font_dialog_title"))
+        if font_dialog.exec_() == QDialog.Accepted:
+            font = font_dialog.selectedFont()
             self.selected_font = font
             self.font_label.setText(f"{font.family()}, {font.pointSize()}pt")
             self.font_label.setFont(font) # Update label preview
@@ -306,28 +340,32 @@ class SettingsDialog(QDialog):
         new_font_size = self.selected_font.pointSize()
         new_auto_lock_timeout = self.auto_lock_combo.currentData()
 
-        if new_lang != self.settings_manager.get("language"):
+        get = self.settings_manager.get
+        changes = {}
+        if new_lang != get("language"):
             self.language_changed = True
-            self.settings_manager.set("language", new_lang)
-        if new_theme != self.settings_manager.get("theme"):
+            changes["language"] = new_lang
+        if new_theme != get("theme"):
             self.theme_changed = True
-            self.settings_manager.set("theme", new_theme)
-        if new_font_family != self.settings_manager.get("font_family") or \
-           new_font_size != self.settings_manager.get("font_size"):
+            changes["theme"] = new_theme
+        if new_font_family != get("font_family") or new_font_size != get("font_size"):
             self.font_changed = True
-            self.settings_manager.set("font_family", new_font_family)
-            self.settings_manager.set("font_size", new_font_size)
-        if new_auto_lock_timeout != self.settings_manager.get("auto_lock_timeout"):
+            changes["font_family"] = new_font_family
+            changes["font_size"] = new_font_size
+        if new_auto_lock_timeout != get("auto_lock_timeout"):
             self.auto_lock_changed = True
-            self.settings_manager.set("auto_lock_timeout", new_auto_lock_timeout)
+            changes["auto_lock_timeout"] = new_auto_lock_timeout
+        self.settings_manager.set_many(changes) # One update, nothing queued if nothing changed
         
-        # Settings manager saves itself when set() is called.
+        # Settings manager writes these to disk shortly after set_many().
         # 2FA changes are already saved (or attempted to be saved) by handle_2fa_state_change.
 
+        super().accept() # Close the dialog first, then tell the user anything they need to know
+        # Only a language change needs a notice (parts of it may need a restart); theme and font
+        # changes are visible right away, so they don't open a message box at all.
         if self.language_changed:
-             QMessageBox.information(self, self.translator.tr("info_title"),
+             QMessageBox.information(self.parentWidget(), self.translator.tr("info_title"),
                                      self.translator.tr("language_change_message"))
-        super().accept() # Close the dialog
 
     def get_changes(self):
         return {
@@ -342,44 +380,49 @@ class SetupWindow(QDialog):
     def __init__(self, translator, parent=None):
         super().__init__(parent)
         self.translator = translator
+        tr = self.translator.tr
         self.master_password = None
 
-        self.setWindowTitle(self.translator.tr("setup_title"))
+        self.setWindowTitle(tr("setup_title"))
         self.setMinimumWidth(400)
         self.setModal(True) # Block other windows
 
         layout = QVBoxLayout(self)
 
-        welcome_label = QLabel(self.translator.tr("setup_welcome"))
+        welcome_label = QLabel(tr("setup_welcome"))
         welcome_label.setAlignment(Qt.AlignCenter)
         welcome_label.setStyleSheet("font-size: 16pt; margin-bottom: 15px;")
 
-        instruction_label = QLabel(self.translator.tr("setup_instruction"))
+        instruction_label = QLabel(tr("setup_instruction"))
         instruction_label.setWordWrap(True)
 
         form_layout = QFormLayout()
         self.password_edit = QLineEdit()
-        self.password_edit.setPlaceholderText(self.translator.tr("master_password_placeholder", 8))
+        self.password_edit.setPlaceholderText(tr("master_password_placeholder", 8))
         self.password_edit.setEchoMode(QLineEdit.Password)
         
         self.confirm_password_edit = QLineEdit()
-        self.confirm_password_edit.setPlaceholderText(self.translator.tr("confirm_password_placeholder"))
+        self.confirm_password_edit.setPlaceholderText(tr("confirm_password_placeholder"))
         self.confirm_password_edit.setEchoMode(QLineEdit.Password)
 
-        form_layout.addRow(self.translator.tr("master_password_label"), self.password_edit)
-        form_layout.addRow(self.translator.tr("confirm_password_label"), self.confirm_password_edit)
+        form_layout.addRow(tr("master_password_label"), self.password_edit)
+        form_layout.addRow(tr("confirm_password_label"), self.confirm_password_edit)
 
         self.strength_label = QLabel() # Text set by update_strength_display
-        self.password_edit.textChanged.connect(self.update_strength_display)
-        form_layout.addRow(self.translator.tr("password_strength_label"), self.strength_label)
+        self._strength_state = StrengthIndicatorState()
+        self._shown_strength = None # (text, style sheet) currently on the label
+        self._strength_timer = _make_debounce_timer(
+            self, lambda: self.update_strength_display(self.password_edit.text()))
+        self.password_edit.textChanged.connect(self._strength_timer.start)
+        form_layout.addRow(tr("password_strength_label"), self.strength_label)
 
         layout.addWidget(welcome_label)
         layout.addWidget(instruction_label)
         layout.addLayout(form_layout)
 
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        self.button_box.button(QDialogButtonBox.Ok).setText(self.translator.tr("create_button"))
-        self.button_box.button(QDialogButtonBox.Cancel).setText(self.translator.tr("cancel_button"))
+        self.button_box.button(QDialogButtonBox.Ok).setText(tr("create_button"))
+        self.button_box.button(QDialogButtonBox.Cancel).setText(tr("cancel_button"))
         self.button_box.button(QDialogButtonBox.Ok).setEnabled(False) # Initially disabled
 
         self.button_box.accepted.connect(self.validate_and_accept)
@@ -402,11 +445,14 @@ class SetupWindow(QDialog):
         if strength_text == self.translator.tr("password_strength_weak"): return 2
         if strength_text == self.translator.tr("password_strength_medium"): return 3
         if strength_text == self.translator.tr("password_strength_strong"): return 4
-        if strength_text == self.translator.tr("password_strength_very_strong"): return 5 # Assuming this key exists
         return 0 # Default unknown
 
     def update_strength_display(self, password_text):
-        strength_text, style_sheet = check_password_strength_util(password_text, self.translator)
+        strength = self._strength_state.update(password_text, self.translator)
+        if strength == self._shown_strength:
+            return
+        self._shown_strength = strength
+        strength_text, style_sheet = strength
         self.strength_label.setText(strength_text)
         self.strength_label.setStyleSheet(style_sheet)
 
@@ -451,9 +497,10 @@ class LoginWindow(QDialog):
     def __init__(self, translator, parent=None):
         super().__init__(parent)
         self.translator = translator
+        tr = self.translator.tr
         self.master_password = None
 
-        self.setWindowTitle(f"{APP_NAME} - {self.translator.tr('login_title')}")
+        self.setWindowTitle(f"{APP_NAME} - {tr('login_title')}")
         self.setMinimumWidth(350)
         self.setModal(True)
 
@@ -463,11 +510,11 @@ class LoginWindow(QDialog):
         icon_label.setAlignment(Qt.AlignCenter)
         icon_label.setStyleSheet("font-size: 48pt; margin-bottom: 15px;")
 
-        prompt_label = QLabel(self.translator.tr("login_prompt"))
+        prompt_label = QLabel(tr("login_prompt"))
         prompt_label.setAlignment(Qt.AlignCenter)
 
         self.password_edit = QLineEdit()
-        self.password_edit.setPlaceholderText(self.translator.tr("master_password_label"))
+        self.password_edit.setPlaceholderText(tr("master_password_label"))
         self.password_edit.setEchoMode(QLineEdit.Password)
         self.password_edit.returnPressed.connect(self.validate_and_accept) # Allow login with Enter key
 
@@ -483,14 +530,13 @@ class LoginWindow(QDialog):
         layout.addWidget(self.error_label)
 
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        self.button_box.button(QDialogButtonBox.Ok).setText(self.translator.tr("login_button"))
-        self.button_box.button(QDialogButtonBox.Cancel).setText(self.translator.tr("exit_button"))
-        self.button_box.button(QDialogButtonBox.Ok).setEnabled(False) # Disable OK until text is entered
+        self._ok_button = self.button_box.button(QDialogButtonBox.Ok) # Looked up once, used per keystroke
+        self._ok_button.setText(tr("login_button"))
+        self.button_box.button(QDialogButtonBox.Cancel).setText(tr("exit_button"))
+        self._ok_button.setEnabled(False) # Disable OK until text is entered
 
         # Enable OK button only if password field is not empty
-        self.password_edit.textChanged.connect(
-            lambda text: self.button_box.button(QDialogButtonBox.Ok).setEnabled(bool(text.strip()))
-        )
+        self.password_edit.textChanged.connect(self._update_ok_button)
 
         self.button_box.accepted.connect(self.validate_and_accept)
         self.button_box.rejected.connect(self.reject) # Closes dialog, app will exit
@@ -498,6 +544,10 @@ class LoginWindow(QDialog):
         
         self.password_edit.setFocus() # Focus on password field on open
 
+    def _update_ok_button(self, text):
+        # Same as bool(text.strip()) without building the stripped copy
+        self._ok_button.setEnabled(bool(text) and not text.isspace())
+
     def validate_and_accept(self):
         password = self.password_edit.text()
         if not password: # Should be caught by button state, but good for Enter key
@@ -515,4 +565,45 @@ class LoginWindow(QDialog):
         self.password_edit.setFocus()
 
     def get_master_password(self):
-        return self.master_password
\ No newline at end of file
+        return self.master_password
+
+
+class _CallThread(QThread):
+    def __init__(self, func, args, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = self.func(*self.args)
+        except Exception as e: # Re-raised on the GUI thread by run_with_busy_dialog
+            self.error = e
+
+
+def run_with_busy_dialog(translator, parent, func, *args, message_key="unlocking_vault_message"):
+    """
+    Runs func(*args) on a worker thread while the event loop keeps running, and
+    returns its result (or raises its exception). Used for the vault KDF, which
+    takes long enough at unlock/setup to freeze the UI, and for vault saves. A busy
+    indicator showing message_key appears if the call is still running after a short delay.
+    """
+    progress = QProgressDialog(translator.tr(message_key), None, 0, 0, parent)
+    progress.setWindowTitle(translator.tr("app_title"))
+    progress.setWindowModality(Qt.ApplicationModal)
+    progress.setMinimumDuration(300) # ms; quick calls (cached key) never show it
+
+    thread = _CallThread(func, args)
+    loop = QEventLoop()
+    thread.finished.connect(loop.quit)
+    thread.start()
+    if not thread.isFinished():
+        loop.exec_()
+    thread.wait()
+    progress.close()
+    progress.deleteLater()
+    if thread.error is not None:
+        raise thread.error
+    return thread.result
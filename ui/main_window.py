@@ -1,19 +1,24 @@
+import contextlib
+import copy
+import functools
+import logging
 import os
+import threading
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel,
-    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView, QSpacerItem,
+    QTableView, QAbstractItemView, QHeaderView, QSpacerItem,
     QSizePolicy, QAction, QMenuBar, QMenu, QToolBar, QStatusBar, QMessageBox, QDialog, QApplication
 )
-from PyQt5.QtGui import QIcon, QFont, QClipboard
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer
+from PyQt5.QtGui import QIcon, QClipboard, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer, QSortFilterProxyModel
 
 from constants import (
     APP_NAME, APP_VERSION, VAULT_FILE, VAULT_DIR, ICONS_DIR,
-    DEFAULT_THEME, DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE # For apply_app_settings
+    DEFAULT_THEME # For apply_app_settings
 )
-from core.crypto import decrypt_data, encrypt_vault
-from core.utils import ensure_dir
-from .dialogs import AccountDialog, SettingsDialog # Relative import
+from core.crypto import decrypt_vault_file, encrypt_vault, clear_key_cache
+from core.utils import ensure_dir, write_file_atomic
+from .dialogs import AccountDialog, SettingsDialog, run_with_busy_dialog # Relative import
 from .styles import apply_theme # Relative import
 
 # Feature imports
@@ -21,10 +26,80 @@ from features import (
     AutoLockManager,
     BackupRestoreHandler,
     DuplicateCheckerDialog,
-    find_all_duplicate_passwords
+    find_all_duplicate_passwords,
+    clear_2fa_caches
 )
 
+logger = logging.getLogger("mindvault")
+
 DEFAULT_LANG = "en"
+SEARCH_FILTER_DELAY_MS = 150 # Refilter once typing pauses, not on every keystroke
+
+# Fallback file names in ICONS_DIR for the themed icon names used by the actions;
+# names not listed here fall back to name + ".png"
+_ICON_FILES = {
+    "list-add": "add.png", "document-edit": "edit.png", "edit-delete": "delete.png",
+    "edit-copy": "copy.png", "preferences-system": "settings.png",
+    "system-lock-screen": "lock.png", "application-exit": "exit.png",
+    "document-save-as": "backup.png", "document-open": "restore.png",
+    "tools-check-spelling": "duplicates.png"
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _load_icon(name):
+    """
+    Loads an icon, trying the theme first, then ICONS_DIR. Cached so a MainWindow rebuilt
+    after lock/relogin shares the already-decoded icons instead of reading the PNGs again.
+    """
+    themed_icon = QIcon.fromTheme(name)
+    if not themed_icon.isNull():
+        return themed_icon
+
+    path = os.path.join(ICONS_DIR, _ICON_FILES.get(name, name + ".png"))
+    if os.path.exists(path):
+        return QIcon(path)
+    return QIcon() # Return empty icon if not found
+
+
+_ACCOUNT_COLUMNS = ("site", "username", "notes") # Account keys shown in the table, in column order
+
+
+def _account_row_items(account):
+    items = [QStandardItem(account.get(key, "")) for key in _ACCOUNT_COLUMNS]
+    # Store the unique account ID in the first item's UserRole data
+    account_id = account.get("id")
+    if account_id:
+        items[0].setData(account_id, Qt.UserRole)
+    return items
+
+
+def _encrypt_and_write_vault(vault_data, master_password):
+    # Runs on a worker thread (see MainWindow.save_vault): vault_data is a private snapshot,
+    # and encrypt_vault works on its own copy of the derived key, so neither a later edit
+    # nor clear_key_cache() on the GUI thread can change what gets written.
+    encrypted_blob = encrypt_vault(vault_data, master_password)
+    if not encrypted_blob:
+        return False
+    write_file_atomic(VAULT_FILE, encrypted_blob) # Temp file, fsync, replace; owner-only
+    return True
+
+
+def _exclusive_vault_change(method):
+    """
+    Refuses to start a MainWindow add/edit/delete while another change or save is in flight.
+    save_vault spins a local event loop (run_with_busy_dialog), so a second change could
+    otherwise start mid-save and be rolled back, or lost, by the first one. The method wraps
+    its own mutate-then-save section in self._vault_change(), after its dialogs have closed.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if self._vault_busy():
+            self.status_bar.showMessage(self.translator.tr("status_save_in_progress"), 3000)
+            return None
+        return method(self)
+    return wrapper
+
 
 class MainWindow(QMainWindow):
     request_relogin = pyqtSignal() # Signal to controller to handle relogin
@@ -36,6 +111,8 @@ class MainWindow(QMainWindow):
         self.master_key_string = None
         self.vault_data = {"accounts": [], "config": {}} # Ensure config exists
         self._clipboard = QApplication.clipboard() if QApplication.instance() else None # Handle no app instance during tests
+        self._vault_lock = threading.Lock() # Held by save_vault while its worker writes vault.enc
+        self._vault_change_active = False # Set by _vault_change()
 
         # Initialize AutoLockManager (from features)
         self.auto_lock_manager = AutoLockManager(
@@ -61,14 +138,26 @@ class MainWindow(QMainWindow):
         search_layout = QHBoxLayout()
         self.search_label = QLabel() # Text set by retranslate_ui
         self.search_input = QLineEdit()
-        self.search_input.textChanged.connect(self.filter_accounts)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(SEARCH_FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.filter_accounts)
+        self.search_input.textChanged.connect(self._filter_timer.start)
         search_layout.addWidget(self.search_label)
         search_layout.addWidget(self.search_input)
         main_layout.addLayout(search_layout)
 
-        # Accounts table
-        self.accounts_table = QTableWidget()
-        self.accounts_table.setColumnCount(3) # Site, Username, Notes
+        # Accounts table: one item model built from the vault, filtered and sorted by a proxy
+        self.accounts_model = QStandardItemModel(0, 3, self) # Site, Username, Notes
+        self.accounts_proxy = QSortFilterProxyModel(self)
+        self.accounts_proxy.setFilterKeyColumn(-1) # Search matches any column
+        self.accounts_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.accounts_proxy.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.accounts_proxy.setSourceModel(self.accounts_model)
+        self.accounts_table = QTableView()
+        self.accounts_table.setModel(self.accounts_proxy)
+        self.accounts_table.setSortingEnabled(True)
+        self.accounts_table.sortByColumn(0, Qt.AscendingOrder) # By site name
         self.accounts_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.accounts_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.accounts_table.setEditTriggers(QAbstractItemView.NoEditTriggers) # Non-editable cells
@@ -76,7 +165,7 @@ class MainWindow(QMainWindow):
         self.accounts_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch) # Site name stretches
         self.accounts_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents) # Username to contents
         self.accounts_table.verticalHeader().setVisible(False) # Hide row numbers
-        self.accounts_table.itemSelectionChanged.connect(self.update_button_states)
+        self.accounts_table.selectionModel().selectionChanged.connect(self.update_button_states)
         self.accounts_table.doubleClicked.connect(self.edit_selected_account) # Double-click to edit
         main_layout.addWidget(self.accounts_table)
 
@@ -112,27 +201,7 @@ class MainWindow(QMainWindow):
         self.retranslate_ui() # Set initial text for all UI elements
 
     def _icon(self, name):
-        # Helper to load icons, trying theme first, then from ICONS_DIR
-        themed_icon = QIcon.fromTheme(name)
-        if not themed_icon.isNull():
-            return themed_icon
-        
-        # Fallback to file system icon if ICONS_DIR is defined and file exists
-        # Standard names for themed icons often don't have .png
-        # Map common action names to typical file names if necessary
-        icon_map = {
-            "list-add": "add.png", "document-edit": "edit.png", "edit-delete": "delete.png",
-            "edit-copy": "copy.png", "preferences-system": "settings.png",
-            "system-lock-screen": "lock.png", "application-exit": "exit.png",
-            "document-save-as": "backup.png", "document-open": "restore.png",
-            "tools-check-spelling": "duplicates.png"
-        }
-        file_name = icon_map.get(name, name + ".png") # Default to name.png if not in map
-        
-        path = os.path.join(ICONS_DIR, file_name)
-        if os.path.exists(path):
-            return QIcon(path)
-        return QIcon() # Return empty icon if not found
+        return _load_icon(name)
 
     def create_actions(self):
         self.add_act = QAction(self._icon("list-add"), "", self, triggered=self.add_account)
@@ -219,10 +288,7 @@ class MainWindow(QMainWindow):
             return True # New vault, effectively "loaded"
 
         try:
-            with open(VAULT_FILE, 'rb') as f:
-                encrypted_blob = f.read()
-            
-            decrypted_data = decrypt_data(encrypted_blob, self.master_key_string)
+            decrypted_data = decrypt_vault_file(VAULT_FILE, self.master_key_string)
             if decrypted_data is None:
                 # This case should ideally be handled by the login screen itself.
                 # If it occurs here, it implies an issue post-login or a corrupted vault.
@@ -248,7 +314,8 @@ class MainWindow(QMainWindow):
             self.lock_vault() # Force relogin or exit
             return False
 
-    def save_vault(self):
+    def save_vault(self, snapshot=None):
+        """Saves snapshot (default: a copy of vault_data taken now) to VAULT_FILE."""
         if not self.master_key_string:
             QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_save_nokey"))
             return False
@@ -259,87 +326,135 @@ class MainWindow(QMainWindow):
         if "config" not in self.vault_data:
             self.vault_data["config"] = {}
             
-        encrypted_blob = encrypt_vault(self.vault_data, self.master_key_string)
-        if encrypted_blob:
-            try:
-                # Atomic save: write to temp file then replace original
-                temp_file = VAULT_FILE + ".tmp"
-                with open(temp_file, 'wb') as f:
-                    f.write(encrypted_blob)
-                os.replace(temp_file, VAULT_FILE) # Atomic on most OS
-                print("Vault saved successfully.")
-                self.status_bar.showMessage(self.translator.tr("status_vault_saved"), 3000)
-                return True
-            except Exception as e:
-                QMessageBox.critical(self, self.translator.tr("error_title"), f"{self.translator.tr('error_save_vault')}\n{e}")
-                if os.path.exists(temp_file): # Cleanup temp file on error
-                    try: os.remove(temp_file)
-                    except OSError: pass
-                return False
-        else:
+        # Serializing, encrypting and fsyncing run off the GUI thread so the window keeps
+        # repainting; the worker gets its own copy of the vault, never the live dicts.
+        if snapshot is None:
+            snapshot = copy.deepcopy(self.vault_data)
+        snapshot.setdefault("config", {})
+        # Every save path (account changes, the 2FA toggle) goes through here, so two
+        # workers never write vault.enc(.tmp) at once
+        if not self._vault_lock.acquire(blocking=False):
+            self.status_bar.showMessage(self.translator.tr("status_save_in_progress"), 3000)
+            return False
+        try:
+            saved = run_with_busy_dialog(self.translator, self, _encrypt_and_write_vault,
+                                         snapshot, self.master_key_string, message_key="saving_vault_message")
+        except Exception as e:
+            QMessageBox.critical(self, self.translator.tr("error_title"), f"{self.translator.tr('error_save_vault')}\n{e}")
+            return False
+        finally:
+            self._vault_lock.release()
+        if not saved:
              QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_encryption_failed_save"))
              return False
-
-    def populate_accounts_table(self, filter_text=""):
-        self.accounts_table.setSortingEnabled(False) # Disable sorting during population
-        self.accounts_table.setRowCount(0) # Clear existing rows
-        
-        filter_text = filter_text.lower().strip()
-        current_accounts = self.vault_data.get("accounts", [])
-        
-        accounts_to_display = []
-        if filter_text:
-            for account in current_accounts:
-                site_match = filter_text in account.get("site", "").lower()
-                user_match = filter_text in account.get("username", "").lower()
-                notes_match = filter_text in account.get("notes", "").lower()
-                if site_match or user_match or notes_match:
-                    accounts_to_display.append(account)
-        else:
-            accounts_to_display = current_accounts
-            
-        # Sort accounts by site name (case-insensitive) before displaying
-        accounts_to_display.sort(key=lambda x: x.get("site", "").lower())
-            
-        for account in accounts_to_display:
-            row_position = self.accounts_table.rowCount()
-            self.accounts_table.insertRow(row_position)
-            
-            site_item = QTableWidgetItem(account.get("site", ""))
-            username_item = QTableWidgetItem(account.get("username", ""))
-            notes_item = QTableWidgetItem(account.get("notes", ""))
-            
-            # Store the unique account ID in the first item's UserRole data
-            account_id = account.get("id")
-            if account_id:
-                site_item.setData(Qt.UserRole, account_id)
-            
-            self.accounts_table.setItem(row_position, 0, site_item)
-            self.accounts_table.setItem(row_position, 1, username_item)
-            self.accounts_table.setItem(row_position, 2, notes_item)
-            
-        self.accounts_table.setSortingEnabled(True) # Re-enable sorting
+        logger.info("Vault saved successfully.")
+        self.status_bar.showMessage(self.translator.tr("status_vault_saved"), 3000)
+        return True
+
+    def populate_accounts_table(self, filter_text="", select_id=None):
+        if self._accounts_model_stale:
+            self._rebuild_accounts_model()
+        # The proxy filters and keeps the rows sorted in C++; no items are recreated per keystroke.
+        # Rows patched in by add/edit are already filtered and sorted, so only a new search refilters.
+        filter_text = filter_text.strip()
+        if filter_text != self.accounts_proxy.filterRegExp().pattern():
+            self.accounts_proxy.setFilterFixedString(filter_text)
+        if select_id:
+            self._select_account_row(select_id)
         self.update_button_states()
 
+    def _rebuild_accounts_model(self):
+        accounts = self.vault_data.get("accounts")
+        if not isinstance(accounts, list):
+            accounts = []
+        # Detached while filling so the proxy sorts and filters once at the end, not per row
+        self.accounts_proxy.setSourceModel(None)
+        self.accounts_model.setRowCount(0) # Clear existing rows
+        for account in accounts:
+            self.accounts_model.appendRow(_account_row_items(account))
+        self.accounts_proxy.setSourceModel(self.accounts_model)
+        self._accounts_model_stale = False
+
+    # add/edit/delete patch the model row by row once the vault is saved, so the
+    # other rows keep their items; only a whole-vault swap rebuilds the model.
+    def _find_model_row(self, account_id):
+        matches = self.accounts_model.match(self.accounts_model.index(0, 0), Qt.UserRole, account_id, 1, Qt.MatchExactly)
+        return matches[0].row() if matches else -1
+
+    def _add_model_row(self, account):
+        if not self._accounts_model_stale: # Otherwise the pending rebuild picks it up
+            self.accounts_model.appendRow(_account_row_items(account))
+
+    def _update_model_row(self, account_id, account):
+        if self._accounts_model_stale:
+            return
+        row = self._find_model_row(account_id)
+        if row < 0:
+            self._accounts_model_stale = True
+            return
+        for column, key in enumerate(_ACCOUNT_COLUMNS):
+            self.accounts_model.item(row, column).setText(account.get(key, ""))
+
+    def _remove_model_row(self, account_id):
+        if self._accounts_model_stale:
+            return
+        row = self._find_model_row(account_id)
+        if row >= 0:
+            self.accounts_model.removeRow(row)
+
+    def _select_account_row(self, account_id):
+        matches = self.accounts_proxy.match(self.accounts_proxy.index(0, 0), Qt.UserRole, account_id, 1, Qt.MatchExactly)
+        if matches:
+            self.accounts_table.selectRow(matches[0].row())
+
     def filter_accounts(self):
         self.populate_accounts_table(self.search_input.text())
 
     def get_selected_account_id(self):
-        selected_rows = self.accounts_table.selectionModel().selectedRows()
+        selected_rows = self.accounts_table.selectionModel().selectedRows() # Column 0 indexes
         if selected_rows:
-            # Assuming ID is stored in the first column's item
-            first_item = self.accounts_table.item(selected_rows[0].row(), 0) 
-            if first_item:
-                return first_item.data(Qt.UserRole) # Retrieve stored ID
+            return selected_rows[0].data(Qt.UserRole) # Retrieve stored ID
         return None
 
+    @property
+    def vault_data(self):
+        return self._vault_data
+
+    @vault_data.setter
+    def vault_data(self, value): # Every whole-vault swap (load, lock, login) rebuilds the id index
+        self._vault_data = value
+        self._reindex_accounts()
+
+    def _reindex_accounts(self):
+        self._accounts_model_stale = True
+        accounts = self._vault_data.get("accounts")
+        if not isinstance(accounts, list):
+            self._accounts_by_id = {}
+            return
+        # reversed() so the first account wins on a duplicated id, as the old linear scan did
+        self._accounts_by_id = {account.get("id"): account for account in reversed(accounts) if account.get("id")}
+
+    def _vault_busy(self):
+        return self._vault_lock.locked() or self._vault_change_active
+
+    @contextlib.contextmanager
+    def _vault_change(self):
+        # Only the mutate-and-save section, never a dialog waiting on the user: lock_vault
+        # waits for this, and must still be able to lock while Add/Edit is left open
+        self._vault_change_active = True
+        try:
+            yield
+        finally:
+            self._vault_change_active = False
+
+    def _is_same_vault_open(self, vault_data):
+        # Auto-lock can fire while a dialog is open; a change meant for that vault is dropped
+        return bool(self.master_key_string) and self.vault_data is vault_data
+
     def get_account_by_id(self, account_id):
-        if not account_id or not isinstance(self.vault_data.get("accounts"), list):
+        if not account_id:
             return None
-        for account in self.vault_data["accounts"]:
-            if account.get("id") == account_id:
-                return account
-        return None
+        return self._accounts_by_id.get(account_id)
 
     def update_button_states(self):
         has_selection = bool(self.get_selected_account_id())
@@ -366,35 +481,37 @@ class MainWindow(QMainWindow):
         self.check_duplicates_act.setEnabled(can_operate_on_vault)
 
 
+    @_exclusive_vault_change
     def add_account(self):
         if not self.master_key_string: # Should be disabled by update_button_states, but as safeguard
             QMessageBox.warning(self, self.translator.tr("warning_title"), self.translator.tr("unlock_vault_first"))
             return
 
+        vault_data = self.vault_data
         new_data = AccountDialog.show_dialog(
             self.translator,
             all_accounts_data=self.vault_data.get("accounts", []), # Pass all accounts for duplicate check
             parent=self
         )
-        if new_data:
-            if not isinstance(self.vault_data.get("accounts"), list): # Should not happen if vault_data is initialized well
-                self.vault_data["accounts"] = []
-            self.vault_data["accounts"].append(new_data)
-            if self.save_vault():
-                current_filter = self.search_input.text()
-                self.populate_accounts_table(current_filter) # Refresh table
-                # Try to select the newly added item
-                for row in range(self.accounts_table.rowCount()):
-                     item = self.accounts_table.item(row, 0)
-                     if item and item.data(Qt.UserRole) == new_data['id']:
-                         self.accounts_table.selectRow(row)
-                         break
-                self.status_bar.showMessage(self.translator.tr("status_account_added", new_data['site']), 3000)
-            else:
-                # If save failed, revert the addition from memory
-                self.vault_data["accounts"].pop() 
-                QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_add_failed"))
+        if new_data and self._is_same_vault_open(vault_data):
+            with self._vault_change():
+                if not isinstance(self.vault_data.get("accounts"), list): # Should not happen if vault_data is initialized well
+                    self.vault_data["accounts"] = []
+                self.vault_data["accounts"].append(new_data)
+                self._accounts_by_id.setdefault(new_data["id"], new_data)
+                if self.save_vault(copy.deepcopy(self.vault_data)): # Exactly the state just mutated
+                    self._add_model_row(new_data)
+                    current_filter = self.search_input.text()
+                    self.populate_accounts_table(current_filter, select_id=new_data['id']) # Refresh and select the new item
+                    self.status_bar.showMessage(self.translator.tr("status_account_added", new_data['site']), 3000)
+                else:
+                    # If save failed, revert the addition from memory
+                    self.vault_data["accounts"].pop() 
+                    if self._accounts_by_id.get(new_data["id"]) is new_data:
+                        del self._accounts_by_id[new_data["id"]]
+                    QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_add_failed"))
 
+    @_exclusive_vault_change
     def edit_selected_account(self):
         selected_id = self.get_selected_account_id()
         if not selected_id: return
@@ -406,6 +523,7 @@ class MainWindow(QMainWindow):
              return
 
         original_account_copy = account_to_edit.copy() # For rollback on save failure
+        vault_data = self.vault_data
         
         updated_data = AccountDialog.show_dialog(
             self.translator,
@@ -414,33 +532,27 @@ class MainWindow(QMainWindow):
             parent=self
         )
         
-        if updated_data:
-            try:
-                # Find index of the account to update
-                index_to_update = next(i for i, acc in enumerate(self.vault_data["accounts"]) if acc.get("id") == selected_id)
-                self.vault_data["accounts"][index_to_update] = updated_data
-                
-                if self.save_vault():
+        if updated_data and self._is_same_vault_open(vault_data):
+            with self._vault_change():
+                # account_to_edit is the dict stored in vault_data["accounts"] (and in the id index),
+                # so it is updated in place rather than searched for by position in the list
+                account_to_edit.clear()
+                account_to_edit.update(updated_data)
+            
+                if self.save_vault(copy.deepcopy(self.vault_data)):
+                    self._update_model_row(selected_id, account_to_edit)
                     current_filter = self.search_input.text()
-                    self.populate_accounts_table(current_filter)
-                    # Try to re-select the edited item
-                    for row in range(self.accounts_table.rowCount()):
-                         item = self.accounts_table.item(row, 0)
-                         if item and item.data(Qt.UserRole) == selected_id:
-                             self.accounts_table.selectRow(row)
-                             break
+                    self.populate_accounts_table(current_filter, select_id=selected_id) # Re-select the edited item
                     self.status_bar.showMessage(self.translator.tr("status_account_updated", updated_data['site']), 3000)
                 else:
                      # Rollback if save failed
-                     self.vault_data["accounts"][index_to_update] = original_account_copy
+                     account_to_edit.clear()
+                     account_to_edit.update(original_account_copy)
                      self.populate_accounts_table(self.search_input.text()) # Refresh with original
                      QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_update_failed"))
-            except StopIteration:
-                 # Account ID was not found in the list, something is wrong
-                 QMessageBox.warning(self, self.translator.tr("warning_title"), self.translator.tr("warning_account_notfound_during_update"))
-                 self.populate_accounts_table(self.search_input.text())
 
 
+    @_exclusive_vault_change
     def delete_selected_account(self):
         selected_id = self.get_selected_account_id()
         if not selected_id: return
@@ -452,22 +564,27 @@ class MainWindow(QMainWindow):
              return
 
         site_name = account_to_delete.get('site', self.translator.tr("unknown_site"))
+        vault_data = self.vault_data
         reply = QMessageBox.question(self, self.translator.tr("confirm_delete_title"),
                                      self.translator.tr("confirm_delete_message", site_name),
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
-        if reply == QMessageBox.Yes:
-            original_accounts = list(self.vault_data["accounts"]) # Copy for rollback
-            self.vault_data["accounts"] = [acc for acc in self.vault_data["accounts"] if acc.get("id") != selected_id]
+        if reply == QMessageBox.Yes and self._is_same_vault_open(vault_data):
+            with self._vault_change():
+                original_accounts = list(self.vault_data["accounts"]) # Copy for rollback
+                self.vault_data["accounts"] = [acc for acc in self.vault_data["accounts"] if acc.get("id") != selected_id]
+                self._accounts_by_id.pop(selected_id, None)
             
-            if self.save_vault():
-                self.populate_accounts_table(self.search_input.text()) # Refresh table
-                self.status_bar.showMessage(self.translator.tr("status_account_deleted", site_name), 3000)
-            else:
-                 # Rollback if save failed
-                 self.vault_data["accounts"] = original_accounts
-                 self.populate_accounts_table(self.search_input.text())
-                 QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_delete_failed"))
+                if self.save_vault(copy.deepcopy(self.vault_data)):
+                    self._remove_model_row(selected_id)
+                    self.populate_accounts_table(self.search_input.text()) # Refresh table
+                    self.status_bar.showMessage(self.translator.tr("status_account_deleted", site_name), 3000)
+                else:
+                     # Rollback if save failed
+                     self.vault_data["accounts"] = original_accounts
+                     self._accounts_by_id[selected_id] = account_to_delete
+                     self.populate_accounts_table(self.search_input.text())
+                     QMessageBox.critical(self, self.translator.tr("error_title"), self.translator.tr("error_delete_failed"))
 
     def copy_selected_password(self):
         selected_id = self.get_selected_account_id()
@@ -483,7 +600,9 @@ class MainWindow(QMainWindow):
                         3000
                     )
                     # Optional: Clear clipboard after a delay
-                    QTimer.singleShot(15000, lambda: self._clipboard.clear() if self._clipboard.text() == account["password"] else None)
+                    # The password is captured now: an edit updates the account dict in place
+                    password = account["password"]
+                    QTimer.singleShot(15000, lambda: self._clipboard.clear() if self._clipboard.text() == password else None)
                 except Exception as e:
                      QMessageBox.warning(self, self.translator.tr("error_title"), 
                                          f"{self.translator.tr('error_clipboard_copy')}\n{e}")
@@ -534,67 +653,62 @@ class MainWindow(QMainWindow):
         current_theme = self.settings_manager.get("theme", DEFAULT_THEME)
         apply_theme(app, current_theme) # From ui.styles
 
-        font_family = self.settings_manager.get("font_family", DEFAULT_FONT_FAMILY)
-        font_size = self.settings_manager.get("font_size", DEFAULT_FONT_SIZE)
-        app_font = QFont(font_family, font_size)
+        app_font = self.settings_manager.resolved_font()
         app.setFont(app_font)
         
         # Also apply font to this window instance if it's already created
         self.setFont(app_font) 
-        
-        # Force Qt to re-evaluate styles for the new theme/font
-        # This can help with widgets that don't update immediately.
-        self.style().unpolish(self)
-        self.style().polish(self)
-        self.update() # Request a repaint
+        # No manual unpolish/polish needed: setStyleSheet() in apply_theme already
+        # repolishes every widget, and setFont() sends FontChange to the whole tree.
 
     def retranslate_ui(self):
+        tr = self.translator.tr
         self.setWindowTitle(APP_NAME) # App name is not translated by default
-        self.search_label.setText(self.translator.tr("search_label"))
-        self.search_input.setPlaceholderText(self.translator.tr("search_placeholder"))
+        self.search_label.setText(tr("search_label"))
+        self.search_input.setPlaceholderText(tr("search_placeholder"))
         
-        self.accounts_table.setHorizontalHeaderLabels([
-            self.translator.tr("header_site"), 
-            self.translator.tr("header_username"), 
-            self.translator.tr("header_notes")
+        self.accounts_model.setHorizontalHeaderLabels([
+            tr("header_site"), 
+            tr("header_username"), 
+            tr("header_notes")
         ])
         
-        self.add_button.setText(self.translator.tr("add_button"))
-        self.edit_button.setText(self.translator.tr("edit_button"))
-        self.delete_button.setText(self.translator.tr("delete_button"))
-        self.copy_button.setText(self.translator.tr("copy_password_button"))
+        self.add_button.setText(tr("add_button"))
+        self.edit_button.setText(tr("edit_button"))
+        self.delete_button.setText(tr("delete_button"))
+        self.copy_button.setText(tr("copy_password_button"))
         
         # Actions (Tooltips and Menu Text)
-        self.add_act.setText(self.translator.tr("add_action_tooltip"))
-        self.add_act.setToolTip(self.translator.tr("add_action_tooltip"))
-        self.edit_act.setText(self.translator.tr("edit_action_tooltip"))
-        self.edit_act.setToolTip(self.translator.tr("edit_action_tooltip"))
-        self.delete_act.setText(self.translator.tr("delete_action_tooltip"))
-        self.delete_act.setToolTip(self.translator.tr("delete_action_tooltip"))
-        self.copy_act.setText(self.translator.tr("copy_action_tooltip"))
-        self.copy_act.setToolTip(self.translator.tr("copy_action_tooltip"))
-        self.settings_act.setText(self.translator.tr("settings_action_tooltip"))
-        self.settings_act.setToolTip(self.translator.tr("settings_action_tooltip"))
-        self.lock_act.setText(self.translator.tr("lock_action_tooltip"))
-        self.lock_act.setToolTip(self.translator.tr("lock_action_tooltip"))
-        self.exit_act.setText(self.translator.tr("exit_action_tooltip"))
-        self.exit_act.setToolTip(self.translator.tr("exit_action_tooltip"))
-        self.about_act.setText(self.translator.tr("about_action_tooltip")) # About typically only text
-        self.backup_act.setText(self.translator.tr("backup_vault_menu"))
-        self.backup_act.setToolTip(self.translator.tr("backup_vault_tooltip"))
-        self.restore_act.setText(self.translator.tr("restore_vault_menu"))
-        self.restore_act.setToolTip(self.translator.tr("restore_vault_tooltip"))
-        self.check_duplicates_act.setText(self.translator.tr("check_duplicates_menu"))
-        self.check_duplicates_act.setToolTip(self.translator.tr("check_duplicates_tooltip"))
+        self.add_act.setText(tr("add_action_tooltip"))
+        self.add_act.setToolTip(tr("add_action_tooltip"))
+        self.edit_act.setText(tr("edit_action_tooltip"))
+        self.edit_act.setToolTip(tr("edit_action_tooltip"))
+        self.delete_act.setText(tr("delete_action_tooltip"))
+        self.delete_act.setToolTip(tr("delete_action_tooltip"))
+        self.copy_act.setText(tr("copy_action_tooltip"))
+        self.copy_act.setToolTip(tr("copy_action_tooltip"))
+        self.settings_act.setText(tr("settings_action_tooltip"))
+        self.settings_act.setToolTip(tr("settings_action_tooltip"))
+        self.lock_act.setText(tr("lock_action_tooltip"))
+        self.lock_act.setToolTip(tr("lock_action_tooltip"))
+        self.exit_act.setText(tr("exit_action_tooltip"))
+        self.exit_act.setToolTip(tr("exit_action_tooltip"))
+        self.about_act.setText(tr("about_action_tooltip")) # About typically only text
+        self.backup_act.setText(tr("backup_vault_menu"))
+        self.backup_act.setToolTip(tr("backup_vault_tooltip"))
+        self.restore_act.setText(tr("restore_vault_menu"))
+        self.restore_act.setToolTip(tr("restore_vault_tooltip"))
+        self.check_duplicates_act.setText(tr("check_duplicates_menu"))
+        self.check_duplicates_act.setToolTip(tr("check_duplicates_tooltip"))
         
         # Menus
-        self.file_menu.setTitle(self.translator.tr("menu_file"))
-        self.edit_menu.setTitle(self.translator.tr("menu_edit"))
-        self.tools_menu.setTitle(self.translator.tr("menu_tools"))
-        self.help_menu.setTitle(self.translator.tr("menu_help"))
+        self.file_menu.setTitle(tr("menu_file"))
+        self.edit_menu.setTitle(tr("menu_edit"))
+        self.tools_menu.setTitle(tr("menu_tools"))
+        self.help_menu.setTitle(tr("menu_help"))
         
-        self.toolbar.setWindowTitle(self.translator.tr("main_toolbar_title"))
-        self.status_bar.showMessage(self.translator.tr("status_ready")) # Default status
+        self.toolbar.setWindowTitle(tr("main_toolbar_title"))
+        self.status_bar.showMessage(tr("status_ready")) # Default status
 
         # Update layout direction for the main window itself
         direction = Qt.RightToLeft if self.translator.locale == 'ar' else Qt.LeftToRight
@@ -605,9 +719,14 @@ class MainWindow(QMainWindow):
         # Table headers also respect layoutDirection set on QApplication or self.accounts_table
 
     def lock_vault(self):
-        print("Locking vault...")
+        if self._vault_busy(): # A change or save is in flight; lock once it has finished
+            QTimer.singleShot(200, self.lock_vault)
+            return
+        logger.info("Locking vault...")
         self.auto_lock_manager.stop() # Stop auto-lock timer
         self.master_key_string = None
+        clear_key_cache() # Drop cached derived keys along with the password
+        clear_2fa_caches() # And the decoded TOTP secret / otpauth QR
         self.vault_data = {"accounts": [], "config": {}} # Clear sensitive data
         self.populate_accounts_table() # Clear table display
         self.update_button_states() # Disable most buttons
@@ -626,10 +745,16 @@ class MainWindow(QMainWindow):
                           f"Cryptography via 'cryptography' library.")
 
     def closeEvent(self, event): # Standard Qt event handler
-        print("Closing MindVault main window.")
+        if self._vault_busy(): # A save may still be writing vault.enc; close once it has finished
+            event.ignore()
+            QTimer.singleShot(200, self.close)
+            return
+        logger.info("Closing MindVault main window.")
         self.auto_lock_manager.stop() # Ensure timer is stopped
         # Clearing sensitive data is good practice, though app is exiting
         self.master_key_string = None 
+        clear_key_cache()
+        clear_2fa_caches()
         self.vault_data = {}
         # The request_relogin signal is not appropriate here as it's a full close
         event.accept() # Allow window to close
@@ -652,6 +777,9 @@ class MainWindow(QMainWindow):
 
     def perform_restore(self):
         # Restore can be initiated even if locked, as it will force a re-login.
+        if self._vault_busy(): # It replaces vault.enc, which an in-flight save is writing
+            self.status_bar.showMessage(self.translator.tr("status_save_in_progress"), 3000)
+            return
         if self.backup_restore_handler.restore_vault(): # This shows its own messages
             self.status_bar.showMessage(self.translator.tr("status_vault_restored_relogin"), 5000)
             self.lock_vault() # Force re-login with potentially new/restored vault